@@ -1,26 +1,21 @@
-import random
 import numpy as np
-from manimlib.imports import VGroup, WHITE, Square, DL, UR, interpolate
+from manimlib.imports import VGroup, WHITE, Square, color_to_rgb, rgb_to_color
 # from app.modules.graphics.Rectangle import Rectangle
-from app.modules.person import Person
 # from app.helpers.math import interpolate
 
 
 class City(VGroup):
-    def __init__(self, city_size=2, population=100, person_config={}, ** kwargs):
+    def __init__(self, city_size=2, colors_set={}, ** kwargs):
         super().__init__(**kwargs)
 
         self.time = 0
 
-        self.person_config = person_config
+        self.colors_set = colors_set
 
         self.city_size = city_size
-        self.population = population
 
         self.borer_color = WHITE
 
-        self.people = VGroup()
-
         self._create_graphic()
 
     def _create_graphic(self):
@@ -28,24 +23,16 @@ class City(VGroup):
         rectangle.set_height(self.city_size)
         rectangle.set_stroke(WHITE, 3)
 
+        self.rectangle = rectangle
+
         self.add(rectangle)
 
-    def populate(self):
-        self.position = self.get_center()
-        self.bounds = (self.get_corner(DL), self.get_corner(UR))
-
-        for i in range(self.population):
-            position = [
-                interpolate(lower, upper, random.random())
-                for lower, upper in zip(*self.bounds)
-            ]
-
-            self.people.add(
-                Person(
-                    position=position,
-                    city_bounds=self.bounds,
-                    config=self.person_config
-                )
-            )
-
-        self.add(self.people)
+    def show_stats(self, stats):
+        # Stands in for the people when they are too small to be drawn,
+        # the city is filled with the S/I/R colors mixed by their share
+        rgbs = np.array([color_to_rgb(self.colors_set[status])
+                         for status in 'SIR'])
+
+        fractions = stats / max(stats.sum(), 1)
+
+        self.rectangle.set_fill(rgb_to_color(fractions @ rgbs), opacity=.8)
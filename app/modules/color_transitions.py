@@ -0,0 +1,69 @@
+import numpy as np
+from manimlib.imports import interpolate, sigmoid
+
+
+def smooth(alphas, inflection=10.0):
+    # The smooth rate function of manim, over arrays
+    error = sigmoid(-inflection / 2)
+
+    return np.clip((sigmoid(inflection * (alphas - 0.5)) - error) / (1 - 2 * error), 0, 1)
+
+
+class ColorTransitions:
+    def __init__(self, population_mobject, duration=1):
+        # One row per person of the population mobject, the running
+        # transitions are interpolated together on every update
+        self.population_mobject = population_mobject
+        self.duration = duration
+
+        size = len(population_mobject.points)
+
+        self.start_rgbas = np.zeros((size, 4))
+        self.end_rgbas = np.zeros((size, 4))
+        self.start_ring_opacities = np.zeros(size)
+        self.end_ring_opacities = np.zeros(size)
+
+        # NaN when the person is not changing
+        self.start_times = np.full(size, np.nan)
+        self.durations = np.full(size, duration, dtype=np.float64)
+
+        self.active_indices = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.active_indices)
+
+    def start(self, indices, start_rgbas, end_rgbas, start_ring_opacities, end_ring_opacities, start_times):
+        # A transition started again replaces the running one
+        self.start_rgbas[indices] = start_rgbas
+        self.end_rgbas[indices] = end_rgbas
+        self.start_ring_opacities[indices] = start_ring_opacities
+        self.end_ring_opacities[indices] = end_ring_opacities
+        self.start_times[indices] = start_times
+        self.durations[indices] = self.duration
+
+        self.active_indices = np.union1d(self.active_indices, indices)
+
+    def clear(self):
+        self.start_times[:] = np.nan
+        self.active_indices = np.zeros(0, dtype=np.int64)
+
+    def update(self, time):
+        indices = self.active_indices
+
+        if len(indices) == 0:
+            return
+
+        alphas = np.clip(
+            (time - self.start_times[indices]) / self.durations[indices], 0, 1)
+        smoothed = smooth(alphas)
+
+        self.population_mobject.set_rgbas(interpolate(
+            self.start_rgbas[indices], self.end_rgbas[indices], smoothed[:, np.newaxis]), indices)
+        self.population_mobject.set_ring_opacities(interpolate(
+            self.start_ring_opacities[indices], self.end_ring_opacities[indices], smoothed), indices)
+
+        # The finished ones are left at their end
+        finished = alphas >= 1
+
+        self.start_times[indices[finished]] = np.nan
+        self.active_indices = indices[~finished]
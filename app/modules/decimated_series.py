@@ -0,0 +1,99 @@
+import numpy as np
+
+
+class DecimatedSeries:
+    def __init__(self, number_of_buckets=512):
+        # The whole series is kept as at most number_of_buckets buckets of
+        # bucket_size samples, each keeping its minimum and maximum.
+        # When the buckets are full, neighbours are merged and bucket_size doubles,
+        # so appending is amortized O(1) and the number of points stays bounded
+        self.number_of_buckets = number_of_buckets + number_of_buckets % 2
+
+        self.bucket_size = 1
+        self.size = 0
+        self.number_of_samples = 0
+
+        # Per bucket, the sample indices and values of its extremes
+        self.minimum_indices = np.zeros(self.number_of_buckets, dtype=np.int64)
+        self.minima = np.zeros(self.number_of_buckets)
+        self.maximum_indices = np.zeros(self.number_of_buckets, dtype=np.int64)
+        self.maxima = np.zeros(self.number_of_buckets)
+
+    def __len__(self):
+        return self.number_of_samples
+
+    def append(self, value):
+        index = self.number_of_samples
+
+        # Bucket k holds the samples k * bucket_size to (k + 1) * bucket_size - 1
+        if index // self.bucket_size < self.size:
+            bucket = self.size - 1
+
+            if value < self.minima[bucket]:
+                self.minimum_indices[bucket], self.minima[bucket] = index, value
+            if value > self.maxima[bucket]:
+                self.maximum_indices[bucket], self.maxima[bucket] = index, value
+        else:
+            if self.size == self.number_of_buckets:
+                self._merge_buckets()
+
+            bucket = self.size
+
+            self.minimum_indices[bucket] = self.maximum_indices[bucket] = index
+            self.minima[bucket] = self.maxima[bucket] = value
+
+            self.size += 1
+
+        self.number_of_samples += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        self.bucket_size = 1
+        self.size = 0
+        self.number_of_samples = 0
+
+    def _merge_buckets(self):
+        half = self.size // 2
+
+        minimum_first = self.minima[0:self.size:2] <= self.minima[1:self.size:2]
+        maximum_first = self.maxima[0:self.size:2] >= self.maxima[1:self.size:2]
+
+        self.minimum_indices[:half] = np.where(
+            minimum_first, self.minimum_indices[0:self.size:2], self.minimum_indices[1:self.size:2])
+        self.minima[:half] = np.where(
+            minimum_first, self.minima[0:self.size:2], self.minima[1:self.size:2])
+        self.maximum_indices[:half] = np.where(
+            maximum_first, self.maximum_indices[0:self.size:2], self.maximum_indices[1:self.size:2])
+        self.maxima[:half] = np.where(
+            maximum_first, self.maxima[0:self.size:2], self.maxima[1:self.size:2])
+
+        self.size = half
+        self.bucket_size *= 2
+
+    def get_points(self):
+        # The extremes of every bucket in the order they happened,
+        # x being the sample index and y the value
+        if self.size == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        minimum_indices = self.minimum_indices[:self.size]
+        maximum_indices = self.maximum_indices[:self.size]
+
+        minimum_first = minimum_indices <= maximum_indices
+
+        xs = np.empty(2 * self.size, dtype=np.int64)
+        ys = np.empty(2 * self.size)
+
+        xs[0::2] = np.where(minimum_first, minimum_indices, maximum_indices)
+        ys[0::2] = np.where(minimum_first, self.minima[:self.size], self.maxima[:self.size])
+        xs[1::2] = np.where(minimum_first, maximum_indices, minimum_indices)
+        ys[1::2] = np.where(minimum_first, self.maxima[:self.size], self.minima[:self.size])
+
+        # A bucket with one sample, or with the same extremes, needs one point
+        keep = np.ones(2 * self.size, dtype=bool)
+        keep[1::2] = minimum_indices != maximum_indices
+
+        return xs[keep], ys[keep]
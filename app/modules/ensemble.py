@@ -0,0 +1,105 @@
+import numpy as np
+from multiprocessing import Pool, cpu_count
+from app.modules.policies import PolicyScheduler
+from app.modules.population_state import INFECTED, RECOVERED
+from app.modules.simulation_engine import SimulationEngine
+
+# The height the scenes draw the simulation at, 90% of manim's FRAME_HEIGHT.
+# Kept here so the workers never import manimlib
+DEFAULT_HEIGHT = 8.0 * .9
+
+
+def run_simulation(config, seed, height, duration, sample_interval, policies=()):
+    # One headless run, the S/I/R fractions every sample_interval.
+    # policies are the (trigger, policy) pairs of the scene, used by this run only
+    engine = SimulationEngine(config=config, height=height, seed=seed)
+
+    engine.policy_scheduler = PolicyScheduler(engine)
+
+    for trigger, policy in policies:
+        engine.policy_scheduler.add(trigger, policy)
+
+    number_of_samples = int(round(duration / sample_interval)) + 1
+    samples = np.zeros((number_of_samples, 3))
+    samples[0] = engine.get_averaged_stats()
+
+    for sample_index in range(1, number_of_samples):
+        # Nothing changes anymore once nobody is infected
+        if engine.get_stats()[INFECTED] == 0:
+            samples[sample_index:] = samples[sample_index - 1]
+            break
+
+        engine.advance(sample_interval)
+        samples[sample_index] = engine.get_averaged_stats()
+
+    return samples
+
+
+def _run_simulation(args):
+    return run_simulation(*args)
+
+
+class Ensemble:
+    def __init__(self, scene_class, number_of_runs=100, duration=60, sample_interval=None, first_seed=0,
+                 number_of_processes=None, percentiles=(5, 25, 50, 75, 95), height=DEFAULT_HEIGHT):
+        # Same config and interventions as the scene, runs are told apart by their seed only
+        self.scene_class = scene_class
+        self.config = scene_class.get_simulation_config()
+
+        self.number_of_runs = number_of_runs
+        self.duration = duration
+        self.sample_interval = sample_interval or scene_class.update_frequency
+        self.seeds = range(first_seed, first_seed + number_of_runs)
+        self.number_of_processes = number_of_processes or cpu_count()
+        self.percentiles = percentiles
+        self.height = height
+
+        self.runs = []
+
+    def run(self):
+        # Yields the summary every time a run ends, the last one has all the runs
+        args = [
+            (self.config, seed, self.height, self.duration, self.sample_interval,
+             self.scene_class.get_policies())
+            for seed in self.seeds
+        ]
+
+        with Pool(self.number_of_processes) as pool:
+            for samples in pool.imap_unordered(_run_simulation, args):
+                self.runs.append(samples)
+
+                yield self.get_summary()
+
+    def run_till_done(self):
+        summary = None
+
+        for summary in self.run():
+            pass
+
+        return summary
+
+    def get_summary(self):
+        runs = np.array(self.runs)
+
+        infected = runs[:, :, INFECTED]
+        peak_indices = infected.argmax(axis=1)
+
+        outcomes = {
+            'peak_infected': infected.max(axis=1),
+            'time_to_peak': peak_indices * self.sample_interval,
+            'final_recovered': runs[:, -1, RECOVERED],
+        }
+
+        return {
+            'number_of_runs': len(runs),
+            'times': np.arange(runs.shape[1]) * self.sample_interval,
+            'percentiles': self.percentiles,
+            # percentile, sample, status
+            'bands': np.percentile(runs, self.percentiles, axis=0),
+            'mean': runs.mean(axis=0),
+            'outcomes': outcomes,
+            'outcome_bands': {
+                name: np.percentile(values, self.percentiles)
+                for name, values in outcomes.items()
+            },
+        }
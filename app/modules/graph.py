@@ -1,9 +1,10 @@
 import numpy as np
 from manimlib.imports import *
+from app.modules.decimated_series import DecimatedSeries
 
 
 class Graph(VGroup):
-    def __init__(self, graph_name='Test', simulation=None, color=WHITE, data_index=0, width=5, height=7, update_frequency=1/2, **kwargs):
+    def __init__(self, graph_name='Test', simulation=None, color=WHITE, data_index=0, width=5, height=7, pixel_size=FRAME_HEIGHT / DEFAULT_PIXEL_HEIGHT, **kwargs):
         super().__init__(**kwargs)
 
         self.graph_name = graph_name
@@ -12,21 +13,23 @@ class Graph(VGroup):
         self.color = color
         self.data_index = data_index
 
-        self.time = 0
-        self.last_time_update = -1
-
-        self.update_frequency = update_frequency
         self.width = width
         self.height = height
 
-        self.data = [self.simulation.get_averaged_stats()]
+        # Only a view of the samples of the simulation
+        self.stats_recorder = self.simulation.stats_recorder
+
+        # What is drawn, two points at most per pixel of the width however long the run
+        self.series = DecimatedSeries(int(np.ceil(width / pixel_size)))
+
+        # The simulation redraws its graphs when it loads a checkpoint
+        self.simulation.graphs.append(self)
 
         self._add_axis()
         self._add_data_visualizer()
         self._add_graph_name()
 
-        self.add_updater(lambda obj, dt: self._update_time(dt))
-        self.add_updater(lambda obj, dt: self._update_graph(dt))
+        self.add_updater(lambda obj, dt: self._update_graph())
 
     def _add_axis(self):
         axes = Axes(
@@ -50,7 +53,11 @@ class Graph(VGroup):
         self.axes = axes
 
     def _add_data_visualizer(self):
-        self.data_visualizer = self._visualize_data()
+        self.data_visualizer = VMobject()
+        self.data_visualizer.set_stroke(width=0)
+        self.data_visualizer.set_fill(self.color, 1)
+
+        self._update_graph()
 
         self.add(self.data_visualizer)
 
@@ -70,33 +77,34 @@ class Graph(VGroup):
         self.add(text_obj)
 
     def _visualize_data(self):
+        # The region is updated in place, its points are bounded by the series
         axes = self.axes
-        data = self.data
+        xs, ys = self.series.get_points()
+
+        xs = xs / max(len(self.series) - 1, 1)
 
         points = [axes.c2p(0, 0)]
 
-        for x, ys in zip(np.linspace(0, 1, len(data)), data):
-            points.append(axes.c2p(x, ys[self.data_index]))
+        for x, y in zip(xs, ys):
+            points.append(axes.c2p(x, y))
 
         points.extend([
             axes.c2p(1, 0)
         ])
 
-        region = VMobject()
-
-        region.set_points_as_corners(points)
-        region.set_stroke(width=0)
-        region.set_fill(self.color, 1)
+        self.data_visualizer.set_points_as_corners(points)
 
-        return region
+    def redraw(self):
+        self.series.clear()
 
-    def _update_time(self, delta_time):
-        self.time += delta_time
+        self._update_graph()
 
-    def _update_graph(self, delta_time):
-        if (self.time - self.last_time_update) > self.update_frequency:
-            self.data.append(self.simulation.get_averaged_stats())
+    def _update_graph(self):
+        # Only the samples recorded since the last update are added
+        if len(self.stats_recorder) == len(self.series):
+            return
 
-            self.data_visualizer.become(self._visualize_data())
+        self.series.extend(self.stats_recorder.get_status_fractions(
+            start=len(self.series))[:, self.data_index])
 
-            self.last_time_update = self.time
+        self._visualize_data()
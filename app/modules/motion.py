@@ -0,0 +1,136 @@
+import numpy as np
+from app.modules.population_state import INFECTED
+
+
+class MotionIntegrator:
+    def __init__(self, wall_buffer=1 / 3, wander_step_size=1, wander_step_duration=1, gravity_strength=.2, random_state=np.random):
+        # Wall buffer is how much likely they'll get near the wall,
+        # and the reverse of how much we push them to the middle
+        self.wall_buffer = wall_buffer
+
+        # Random movement config
+        self.wander_step_size = wander_step_size
+        self.wander_step_duration = wander_step_duration
+        self.gravity_strength = gravity_strength
+
+        self.random_state = random_state
+
+    def step(self, population, city_bounds, time, delta_time, indices=None):
+        # Limited to some people when the cities are stepped in different processes
+        if indices is None:
+            indices = np.flatnonzero(~population.traveling)
+        else:
+            indices = indices[~population.traveling[indices]]
+
+        positions = population.positions[indices]
+        velocities = population.velocities[indices]
+
+        force = self._get_gravity_force(population, indices, positions, time)
+        force += self._get_wall_force(
+            population, indices, positions, velocities, city_bounds)
+        force += self._get_repulsion_force(population, indices, positions)
+
+        velocities += force * delta_time
+
+        # Constrain the speed
+        speeds = np.linalg.norm(velocities, axis=1)
+        max_speeds = population.max_speeds[indices]
+        too_fast = speeds > max_speeds
+
+        velocities[too_fast] *= (max_speeds[too_fast] /
+                                 speeds[too_fast])[:, None]
+
+        population.positions[indices] = positions + velocities * delta_time
+        population.velocities[indices] = velocities
+
+    def _get_gravity_force(self, population, indices, positions, time):
+        if self.wander_step_size != 0:
+            last_step_change_times = population.last_step_change_times[indices]
+            wandering = indices[
+                (time - last_step_change_times) > self.wander_step_duration]
+
+            angles = 2 * np.pi * \
+                self.random_state.random_sample(len(wandering))
+            movement_vectors = np.stack(
+                [np.cos(angles), np.sin(angles), np.zeros(len(wandering))], axis=1)
+
+            population.moving_to[wandering] = population.positions[wandering] + \
+                self.wander_step_size * movement_vectors
+            population.last_step_change_times[wandering] = time
+
+        to = population.moving_to[indices] - positions
+        dists = np.linalg.norm(to, axis=1)
+
+        # People without a target have a NaN distance
+        attracted = dists > 0
+
+        force = np.zeros_like(positions)
+        force[attracted] = self.gravity_strength * \
+            to[attracted] / (dists[attracted, None] ** 3)
+
+        return force
+
+    def _get_wall_force(self, population, indices, positions, velocities, city_bounds):
+        lower_bounds, upper_bounds = city_bounds
+        city_indices = population.city_indices[indices]
+
+        # Infected people keep their infection ring inside the city
+        margins = np.where(
+            population.statuses[indices] == INFECTED,
+            population.infection_radii[indices],
+            .1
+        )[:, None]
+
+        lower_bounds_points = lower_bounds[city_indices, :2] + margins
+        upper_bounds_points = upper_bounds[city_indices, :2] - margins
+
+        to_upper = upper_bounds_points - positions[:, :2]
+        to_lower = positions[:, :2] - lower_bounds_points
+
+        # Make the dot bounce of the wall, and fix the coordinate
+        # so the dot will not go out of the box
+        above = to_upper < 0
+        velocities[:, :2][above] = -np.abs(velocities[:, :2][above])
+        positions[:, :2][above] = upper_bounds_points[above]
+
+        below = to_lower < 0
+        velocities[:, :2][below] = np.abs(velocities[:, :2][below])
+        positions[:, :2][below] = lower_bounds_points[below]
+
+        # This force is to ensure that people will not stay apart and it pushed them to the middle
+        with np.errstate(divide='ignore'):
+            push_from_lower = np.maximum(1 / to_lower - 1 / self.wall_buffer, 0)
+            push_from_upper = np.maximum(1 / to_upper - 1 / self.wall_buffer, 0)
+
+        force = np.zeros_like(positions)
+        force[:, :2] = np.where(to_lower != 0, push_from_lower, 0) - \
+            np.where(to_upper != 0, push_from_upper, 0)
+
+        return force
+
+    def _get_repulsion_force(self, population, indices, positions):
+        force = np.zeros_like(positions)
+
+        social_distance_factors = population.social_distance_factors[indices]
+        repelled = np.flatnonzero(social_distance_factors > 0)
+
+        if len(repelled) == 0 or population.max_neighbours == 0:
+            return force
+
+        neighbours = population.repel_from_indices[indices[repelled]]
+
+        diff_vectors = population.positions[neighbours] - \
+            positions[repelled, None]
+        dists = np.linalg.norm(diff_vectors, axis=2)
+
+        # Empty slots and people on the same spot do not push
+        pushing = (neighbours >= 0) & (dists > 0)
+        dists[~pushing] = 1
+
+        repulsion = np.where(
+            pushing[:, :, None], diff_vectors / (dists[:, :, None] ** 3), 0)
+
+        force[repelled] = -social_distance_factors[repelled, None] * \
+            repulsion.sum(axis=1)
+
+        return force
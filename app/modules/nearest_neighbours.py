@@ -0,0 +1,30 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def get_nearest_neighbours(positions, ids, query_positions, query_ids, k):
+    # The ids of the k nearest positions of every query, a query is never
+    # its own neighbour and rows with less than k neighbours are padded with -1
+    neighbours = np.full((len(query_positions), k), -1, dtype=np.int64)
+
+    if k == 0 or len(positions) == 0 or len(query_positions) == 0:
+        return neighbours
+
+    # One extra candidate in case the query is part of the positions
+    number_of_candidates = min(k + 1, len(positions))
+
+    tree = cKDTree(positions[:, :2])
+    _, candidates = tree.query(query_positions[:, :2], k=number_of_candidates)
+
+    candidates = ids[candidates.reshape(len(query_positions), -1)]
+    is_query = candidates == query_ids[:, None]
+
+    # Push the query to the end of its row, the rest stays sorted by distance
+    order = np.argsort(is_query, axis=1, kind='mergesort')
+    candidates = np.take_along_axis(
+        np.where(is_query, -1, candidates), order, axis=1)
+
+    width = min(k, number_of_candidates)
+    neighbours[:, :width] = candidates[:, :width]
+
+    return neighbours
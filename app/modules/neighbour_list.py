@@ -0,0 +1,62 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from app.modules.spatial_hash import get_distances
+
+
+class NeighbourList:
+    def __init__(self, cutoff, skin):
+        # Verlet lists, per city every pair closer than cutoff + skin when it was built.
+        # Until someone moves more than skin / 2, every pair closer than the cutoff
+        # is still in it, so the list is only rebuilt when that happens
+        self.cutoff = cutoff
+        self.skin = skin
+
+        # city index: the people, their positions and the pairs, both ways, at the last build,
+        # the pairs index the people of the city
+        self.cities = {}
+
+        self.number_of_builds = 0
+
+    def _build(self, city_index, people_indices, positions):
+        people_positions = positions[people_indices]
+
+        pairs = cKDTree(people_positions[:, :2]).query_pairs(
+            self.cutoff + self.skin, output_type='ndarray').reshape(-1, 2)
+
+        # Indices in people_indices
+        first = np.concatenate([pairs[:, 0], pairs[:, 1]])
+        second = np.concatenate([pairs[:, 1], pairs[:, 0]])
+
+        self.cities[city_index] = {
+            'people': people_indices.copy(),
+            'positions': people_positions.copy(),
+            'pairs': (first, second),
+        }
+        self.number_of_builds += 1
+
+    def get_pairs(self, city_index, people_indices, positions):
+        city = self.cities.get(city_index)
+
+        # Someone came or left, or moved too much since the build
+        if city is None or not np.array_equal(city['people'], people_indices) or \
+                np.any(get_distances(city['positions'], positions[people_indices]) > self.skin / 2):
+            self._build(city_index, people_indices, positions)
+
+        return self.cities[city_index]['pairs']
+
+    def get_exposure_pairs(self, city_index, people_indices, positions, infected, susceptible, infection_radii):
+        # The (infected, susceptible) pairs closer than the infection radius,
+        # infected and susceptible are masks over the people of the city
+        first, second = self.get_pairs(city_index, people_indices, positions)
+
+        exposed = infected[first] & susceptible[second]
+        first, second = people_indices[first[exposed]], people_indices[second[exposed]]
+
+        within_radius = get_distances(
+            positions[first], positions[second]) < infection_radii[first]
+        first, second = first[within_radius], second[within_radius]
+
+        # Same ordering as the other paths, by infected then susceptible
+        order = np.lexsort((second, first))
+
+        return first[order], second[order]
@@ -0,0 +1,155 @@
+import numpy as np
+from multiprocessing import Pipe, Process, cpu_count
+from app.modules.population_state import PopulationState
+from app.modules.simulation_engine import SimulationEngine
+
+
+def _run_worker(connection, config, height, size, buffers, seed):
+    # Steps the same group of cities on every step, on the population state
+    # it shares with the main process. Its random stream stays here
+    population_state = PopulationState(
+        size,
+        max_neighbours=config['repel_from_max_number_of_people'],
+        number_of_cities=config['number_of_cities'],
+        buffers=buffers
+    )
+
+    engine = SimulationEngine(
+        config=config, height=height, seed=0, population_state=population_state)
+
+    # The stream of the group starts here, whatever building the engine drew
+    engine.random_state.seed(seed)
+
+    while True:
+        command, args = connection.recv()
+
+        if command == 'step':
+            connection.send(_step_cities(engine, *args))
+        elif command == 'get_random_state':
+            connection.send(engine.random_state.get_state())
+        elif command == 'set_random_state':
+            engine.random_state.set_state(args)
+        elif command == 'close':
+            break
+
+
+def _step_cities(engine, city_indices, grouped_indices, group_starts, time, delta_time,
+                 update_statuses, social_distancing):
+    # grouped_indices are the people of the cities, group_starts where each one starts
+    engine.time = time
+
+    new_infections = infectors = np.zeros(0, dtype=np.int64)
+
+    if update_statuses:
+        new_infections, infectors = engine._update_cities(
+            city_indices, grouped_indices, group_starts, delta_time, social_distancing)
+
+    engine.motion_integrator.step(
+        engine.population_state, engine.city_bounds, time, delta_time, indices=grouped_indices)
+
+    return new_infections, infectors
+
+
+class ParallelSimulationEngine(SimulationEngine):
+    def __init__(self, config={}, height=None, seed=None, number_of_workers=None):
+        super().__init__(config=config, height=height, seed=seed)
+
+        # Cities only meet through travel, so each worker steps a group of them
+        number_of_workers = min(
+            number_of_workers or cpu_count(), self.number_of_cities)
+        self.shards = np.array_split(
+            np.arange(self.number_of_cities), number_of_workers)
+
+        # Every group has its own random stream, kept by the worker stepping it
+        self.connections = []
+        self.workers = []
+
+        for _ in self.shards:
+            connection, worker_connection = Pipe()
+            worker = Process(
+                target=_run_worker,
+                args=(worker_connection, config, height, len(self.population_state),
+                      self.population_state.buffers, self.random_state.randint(2 ** 31)),
+                daemon=True
+            )
+            worker.start()
+
+            self.connections.append(connection)
+            self.workers.append(worker)
+
+    def _create_population_state(self):
+        return PopulationState(
+            self.number_of_cities * self.population,
+            max_neighbours=self.repel_from_max_number_of_people,
+            number_of_cities=self.number_of_cities,
+            shared=True
+        )
+
+    def step(self, delta_time, update_statuses=True):
+        self.time += delta_time
+
+        # Grouped once here, each worker only gets the people of its cities
+        grouped_indices, group_starts = self._group_by_city()
+        social_distancing = self._is_social_distancing()
+
+        for shard, connection in zip(self.shards, self.connections):
+            start, end = group_starts[shard[0]], group_starts[shard[-1] + 1]
+
+            connection.send(('step', (
+                shard, grouped_indices[start:end], group_starts[shard[0]:shard[-1] + 2] - start,
+                self.time, delta_time, update_statuses, social_distancing)))
+
+        # All the cities made their step, the rest touches the whole population
+        for connection in self.connections:
+            self._infect(*connection.recv())
+
+        if update_statuses:
+            self._update_travel(delta_time)
+            self._update_recoveries()
+
+        self._update_travelers()
+
+    def _get_shard_random_states(self):
+        for connection in self.connections:
+            connection.send(('get_random_state', None))
+
+        return [connection.recv() for connection in self.connections]
+
+    def get_checkpoint(self):
+        checkpoint = super().get_checkpoint()
+
+        random_states = self._get_shard_random_states()
+
+        checkpoint['shard_random_state_keys'] = np.array([
+            random_state[1] for random_state in random_states])
+        checkpoint['shard_random_state_positions'] = np.array([
+            random_state[2] for random_state in random_states])
+
+        return checkpoint
+
+    def load_checkpoint(self, checkpoint):
+        super().load_checkpoint(checkpoint)
+
+        # Saved by the serial engine, or with another number of workers,
+        # the shard streams are seeded again from the restored one like on creation
+        if 'shard_random_state_keys' not in checkpoint or \
+                len(checkpoint['shard_random_state_keys']) != len(self.connections):
+            for connection in self.connections:
+                connection.send(('set_random_state', np.random.RandomState(
+                    self.random_state.randint(2 ** 31)).get_state()))
+
+            return
+
+        # Only the state of the shard streams is kept, they never draw gaussians
+        for connection, keys, position in zip(self.connections,
+                                              checkpoint['shard_random_state_keys'],
+                                              checkpoint['shard_random_state_positions']):
+            connection.send(
+                ('set_random_state', ('MT19937', keys, int(position))))
+
+    def close(self):
+        super().close()
+
+        for connection, worker in zip(self.connections, self.workers):
+            connection.send(('close', None))
+            worker.join()
@@ -0,0 +1,253 @@
+import numpy as np
+from app.modules.population_state import STATUSES
+
+
+def get_policy_indices(population_state, city_indices=None):
+    # Everyone, or the people currently in the given cities
+    if city_indices is None:
+        return None
+
+    return np.flatnonzero(np.isin(population_state.city_indices, city_indices))
+
+
+class TimeTrigger:
+    def __init__(self, time):
+        self.time = time
+
+    def is_met(self, engine, time):
+        return time >= self.time
+
+
+class ThresholdTrigger:
+    def __init__(self, threshold, status='I', fraction=False, below=False):
+        # Met when the count, or the share, of a status goes over the threshold,
+        # or under it when below is set
+        self.threshold = threshold
+        self.status_index = STATUSES.index(status)
+        self.fraction = fraction
+        self.below = below
+
+    def is_met(self, engine, time):
+        # Read from the counts the population state keeps up to date
+        totals = engine.population_state.status_totals
+        value = totals[self.status_index]
+
+        if self.fraction:
+            value = value / totals.sum()
+
+        return value < self.threshold if self.below else value > self.threshold
+
+
+class AnyTrigger:
+    def __init__(self, *triggers):
+        # Met as soon as one of the triggers is
+        self.triggers = triggers
+
+    def is_met(self, engine, time):
+        return any(trigger.is_met(engine, time) for trigger in self.triggers)
+
+
+class Policy:
+    def __init__(self, on_start=None):
+        # on_start is called with the policy when it starts, to show it in the scene
+        self.on_start = on_start
+
+    def start(self, engine, time):
+        self.apply(engine)
+
+        if self.on_start is not None:
+            self.on_start(self)
+
+    def apply(self, engine):
+        pass
+
+    def update(self, engine, start_time, time):
+        # Called on every tick once started, False when the policy is over
+        return False
+
+    def get_state(self):
+        return {}
+
+    def set_state(self, state):
+        pass
+
+
+class SocialDistancing(Policy):
+    def __init__(self, social_distance_factor, compliance=1, city_indices=None, **kwargs):
+        super().__init__(**kwargs)
+
+        self.social_distance_factor = social_distance_factor
+        self.compliance = compliance
+        self.city_indices = city_indices
+
+    def apply(self, engine):
+        engine.change_social_distance_factor(
+            self.social_distance_factor,
+            self.compliance,
+            get_policy_indices(engine.population_state, self.city_indices)
+        )
+
+
+class TravelRate(Policy):
+    def __init__(self, travel_rate, **kwargs):
+        super().__init__(**kwargs)
+
+        self.travel_rate = travel_rate
+
+    def apply(self, engine):
+        engine.travel_rate = self.travel_rate
+
+
+class LockdownCycle(Policy):
+    def __init__(self, on_duration, off_duration, social_distance_factor, compliance=1, travel_rate=0,
+                 city_indices=None, number_of_cycles=None, **kwargs):
+        # Lockdowns of on_duration separated by off_duration, travel is reduced
+        # and the complying people distance themselves while it is on
+        super().__init__(**kwargs)
+
+        self.on_duration = on_duration
+        self.off_duration = off_duration
+        self.social_distance_factor = social_distance_factor
+        self.compliance = compliance
+        self.travel_rate = travel_rate
+        self.city_indices = city_indices
+        self.number_of_cycles = number_of_cycles
+
+        self.locked_down = False
+        self.previous_travel_rate = 0
+        self.previous_social_distance_factor = 0
+        self.locked_down_indices = np.zeros(0, dtype=np.int64)
+        self.previous_social_distance_factors = np.zeros(0)
+
+    def apply(self, engine):
+        population = engine.population_state
+
+        # Restored when the lockdown is lifted
+        self.previous_travel_rate = engine.travel_rate
+        self.previous_social_distance_factor = engine.social_distance_factor
+        previous_social_distance_factors = population.social_distance_factors.copy()
+
+        engine.travel_rate = self.travel_rate
+        self.locked_down_indices = engine.change_social_distance_factor(
+            self.social_distance_factor,
+            self.compliance,
+            get_policy_indices(population, self.city_indices)
+        )
+        self.previous_social_distance_factors = previous_social_distance_factors[self.locked_down_indices]
+
+        self.locked_down = True
+
+    def lift(self, engine):
+        # Only what was not changed since by another policy
+        population = engine.population_state
+
+        if engine.travel_rate == self.travel_rate:
+            engine.travel_rate = self.previous_travel_rate
+
+        if engine.social_distance_factor == self.social_distance_factor:
+            engine.social_distance_factor = self.previous_social_distance_factor
+
+        unchanged = population.social_distance_factors[self.locked_down_indices] == \
+            self.social_distance_factor
+
+        population.social_distance_factors[self.locked_down_indices[unchanged]] = \
+            self.previous_social_distance_factors[unchanged]
+
+        self.locked_down = False
+
+    def update(self, engine, start_time, time):
+        period = self.on_duration + self.off_duration
+        cycle, phase = divmod(time - start_time, period)
+
+        if self.number_of_cycles is not None and cycle >= self.number_of_cycles:
+            if self.locked_down:
+                self.lift(engine)
+
+            return False
+
+        if phase < self.on_duration and not self.locked_down:
+            self.apply(engine)
+        elif phase >= self.on_duration and self.locked_down:
+            self.lift(engine)
+
+        return True
+
+    def get_state(self):
+        return {
+            'locked_down': self.locked_down,
+            'previous_travel_rate': self.previous_travel_rate,
+            'previous_social_distance_factor': self.previous_social_distance_factor,
+            'locked_down_indices': self.locked_down_indices,
+            'previous_social_distance_factors': self.previous_social_distance_factors,
+        }
+
+    def set_state(self, state):
+        self.locked_down = bool(state['locked_down'])
+        self.previous_travel_rate = float(state['previous_travel_rate'])
+        self.previous_social_distance_factor = float(
+            state['previous_social_distance_factor'])
+        self.locked_down_indices = state['locked_down_indices'].copy()
+        self.previous_social_distance_factors = state['previous_social_distance_factors'].copy()
+
+
+class PolicyScheduler:
+    def __init__(self, engine):
+        # Policies waiting for their trigger, evaluated once per tick
+        self.engine = engine
+
+        self.triggers = []
+        self.policies = []
+
+        # NaN until the policy starts, running until it is over
+        self.start_times = np.zeros(0)
+        self.running = np.zeros(0, dtype=bool)
+
+    def add(self, trigger, policy):
+        self.triggers.append(trigger)
+        self.policies.append(policy)
+
+        self.start_times = np.append(self.start_times, np.nan)
+        self.running = np.append(self.running, False)
+
+        return policy
+
+    def update(self, time):
+        for index in np.flatnonzero(np.isnan(self.start_times)):
+            if self.triggers[index].is_met(self.engine, time):
+                self.start_times[index] = time
+                self.running[index] = True
+
+                self.policies[index].start(self.engine, time)
+
+        for index in np.flatnonzero(self.running):
+            self.running[index] = self.policies[index].update(
+                self.engine, self.start_times[index], time)
+
+    def get_checkpoint(self):
+        # Copies, both are written in place on the next ticks
+        checkpoint = {
+            'policy_start_times': self.start_times.copy(),
+            'policy_running': self.running.copy(),
+        }
+
+        for index, policy in enumerate(self.policies):
+            for name, value in policy.get_state().items():
+                checkpoint['policy_{}_{}'.format(index, name)] = value
+
+        return checkpoint
+
+    def load_checkpoint(self, checkpoint):
+        if len(checkpoint['policy_start_times']) != len(self.policies):
+            raise Exception("Checkpoint has {} policies, the simulation has {}".format(
+                len(checkpoint['policy_start_times']), len(self.policies)))
+
+        self.start_times = checkpoint['policy_start_times'].copy()
+        self.running = checkpoint['policy_running'].copy()
+
+        for index, policy in enumerate(self.policies):
+            prefix = 'policy_{}_'.format(index)
+
+            policy.set_state({
+                name[len(prefix):]: value
+                for name, value in checkpoint.items() if name.startswith(prefix)
+            })
@@ -0,0 +1,142 @@
+import ctypes
+import numpy as np
+from multiprocessing.sharedctypes import RawArray
+
+
+STATUSES = ('S', 'I', 'R')
+SUSCEPTIBLE, INFECTED, RECOVERED = range(len(STATUSES))
+
+
+def status_code(status):
+    return STATUSES.index(status)
+
+
+class PopulationState:
+    # name: (shape per agent, dtype, fill value),
+    # a string in the shape is read from the attribute of the same name
+    FIELDS = {
+        'positions': ((3,), np.float64, 0),
+        'velocities': ((3,), np.float64, 0),
+        # NaN means the agent has no wander target yet
+        'moving_to': ((3,), np.float64, np.nan),
+        'last_step_change_times': ((), np.float64, -1),
+        'statuses': ((), np.int8, SUSCEPTIBLE),
+        'infection_start_times': ((), np.float64, np.nan),
+        'recovery_times': ((), np.float64, np.nan),
+        'symptomatic': ((), np.bool_, False),
+        'city_indices': ((), np.int32, 0),
+        'traveling': ((), np.bool_, False),
+        'travel_start_times': ((), np.float64, np.nan),
+        'travel_origins': ((3,), np.float64, 0),
+        # Per agent parameters
+        'infection_radii': ((), np.float64, 0),
+        'max_speeds': ((), np.float64, 0),
+        'social_distance_factors': ((), np.float64, 0),
+        # The people each agent is repelled from, -1 is an empty slot
+        'repel_from_indices': (('max_neighbours',), np.int64, -1),
+    }
+
+    def __init__(self, size=0, max_neighbours=0, number_of_cities=1, shared=False, buffers=None):
+        self.size = size
+        self.max_neighbours = max_neighbours
+        self.number_of_cities = number_of_cities
+
+        # Shared arrays live in RawArrays so worker processes can write to them,
+        # passing the buffers of another state gives views on the same memory
+        if shared and buffers is None:
+            buffers = {}
+
+        self.buffers = buffers
+
+        for name, (shape, dtype, fill_value) in self.FIELDS.items():
+            shape = (size, *self.get_field_shape(shape))
+
+            if buffers is None:
+                setattr(self, name, np.full(shape, fill_value, dtype=dtype))
+                continue
+
+            new_buffer = name not in buffers
+
+            if new_buffer:
+                buffers[name] = RawArray(ctypes.c_byte, max(
+                    int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+
+            array = np.frombuffer(
+                buffers[name], dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+            if new_buffer:
+                array[:] = fill_value
+
+            setattr(self, name, array)
+
+        # Kept up to date by set_status and set_city
+        self.status_counts = np.zeros(
+            (number_of_cities, len(STATUSES)), dtype=np.int64)
+        self.status_totals = np.zeros(len(STATUSES), dtype=np.int64)
+
+        self.reset_status_counts()
+
+    def get_field_shape(self, shape):
+        return tuple(
+            getattr(self, dim) if isinstance(dim, str) else dim
+            for dim in shape
+        )
+
+    def __len__(self):
+        return self.size
+
+    def get_status(self, index):
+        return STATUSES[self.statuses[index]]
+
+    def set_status(self, indices, status, time=0):
+        indices = np.unique(indices)
+        code = status_code(status)
+
+        self._update_status_counts(indices, -1)
+        self.statuses[indices] = code
+        self._update_status_counts(indices, 1)
+
+        if status == 'I':
+            self.infection_start_times[indices] = time
+
+    def set_city(self, indices, city_indices):
+        # One city for everyone, or one per index
+        indices, first_occurrences = np.unique(indices, return_index=True)
+
+        if np.ndim(city_indices) > 0:
+            city_indices = np.asarray(city_indices)[first_occurrences]
+
+        self._update_status_counts(indices, -1)
+        self.city_indices[indices] = city_indices
+        self._update_status_counts(indices, 1)
+
+    def _update_status_counts(self, indices, change):
+        statuses = self.statuses[indices]
+
+        np.add.at(self.status_counts,
+                  (self.city_indices[indices], statuses), change)
+        np.add.at(self.status_totals, statuses, change)
+
+    def reset_status_counts(self):
+        # Full scan, needed after the arrays are written directly
+        self.status_counts[:] = 0
+        np.add.at(self.status_counts, (self.city_indices, self.statuses), 1)
+
+        self.status_totals[:] = self.status_counts.sum(axis=0)
+
+    def count_statuses(self, indices=None):
+        statuses = self.statuses if indices is None else self.statuses[indices]
+
+        return np.bincount(statuses, minlength=len(STATUSES))
+
+    def check_status_counts(self):
+        expected_counts = np.zeros_like(self.status_counts)
+        np.add.at(expected_counts, (self.city_indices, self.statuses), 1)
+
+        if not np.array_equal(expected_counts, self.status_counts) or \
+                not np.array_equal(self.count_statuses(), self.status_totals):
+            raise Exception(
+                "Status counts {} do not match the population {}".format(
+                    self.status_counts.tolist(), expected_counts.tolist()
+                )
+            )
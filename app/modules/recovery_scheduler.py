@@ -0,0 +1,27 @@
+import heapq
+import numpy as np
+
+
+class RecoveryScheduler:
+    def __init__(self):
+        # Heap of (recovery time, person index)
+        self.queue = []
+
+    def __len__(self):
+        return len(self.queue)
+
+    def schedule(self, indices, recovery_times):
+        for index, recovery_time in zip(np.atleast_1d(indices), np.atleast_1d(recovery_times)):
+            heapq.heappush(self.queue, (recovery_time, index))
+
+    def pop_due(self, time):
+        # Everyone whose recovery time has passed
+        due = []
+
+        while self.queue and self.queue[0][0] < time:
+            due.append(heapq.heappop(self.queue))
+
+        recovery_times = np.array([entry[0] for entry in due], dtype=np.float64)
+        indices = np.array([entry[1] for entry in due], dtype=np.int64)
+
+        return indices, recovery_times
@@ -0,0 +1,13 @@
+from app.modules.simulation import Simulation
+from app.modules.trajectory import TrajectoryPlayer
+
+
+class ReplaySimulation(Simulation):
+    def __init__(self, trajectory_path=None, **kwargs):
+        # Draws a recorded trajectory, nothing is simulated
+        self.trajectory_path = trajectory_path
+
+        super().__init__(**kwargs)
+
+    def _create_engine(self, config, height):
+        return TrajectoryPlayer(self.trajectory_path, height=height)
@@ -1,88 +1,89 @@
 import numpy as np
-import random
 from manimlib.imports import *
 from app.modules.city import City
-from app.modules.virus import Virus
-import copy
+from app.modules.color_transitions import ColorTransitions
+from app.modules.stats_recorder import StatsRecorder
+from app.modules.policies import PolicyScheduler
+from app.modules.population_state import STATUSES, INFECTED
+from app.modules.simulation_engine import SimulationEngine
+from app.modules.parallel_simulation_engine import ParallelSimulationEngine
 
 
 class Simulation(VGroup):
-    def __init__(self, sliders=False, position=[], height=0, config={}, **kwargs):
+    def __init__(self, sliders=False, position=[], height=0, config={}, pixel_size=None, **kwargs):
         super().__init__(**kwargs)
 
         self.sliders = sliders
         self.position = position
         self.height = height
 
-        self.number_of_cities = config['number_of_cities']
-        self.city_size = config['city_size']
-        self.population = config['population']
-
-        # Social Distancing
-        self.limit_social_distancing_to_infectious = config['limit_social_distancing_to_infectious']
-        self.social_distance_factor = config['social_distance_factor']
-        self.repel_from_max_number_of_people = config['repel_from_max_number_of_people']
-
         # Person config
         self.radius = config['radius']
-        self.infection_radius = config['infection_radius']
-        self.wall_buffer = config['wall_buffer']
-        self.wander_step_size = config['wander_step_size']
-        self.wander_step_duration = config['wander_step_duration']
-        self.gravity_strength = config['gravity_strength']
-        self.p_symptomatic_on_infection = config['p_symptomatic_on_infection']
-        self.max_speed = config['max_speed']
-
-        # Virus config
-        self.infection_duration = config['infection_duration']
-        self.probability_of_infection_per_day = config['probability_of_infection_per_day']
-
-        # Travel config
-        self.travel_rate = config['travel_rate']
 
         self.colors_set = config['colors_set']
+        self.status_change_run_time = 1
 
         self.time = 0
         self.add_updater(lambda obj, dt: obj._update_time(dt))
 
-        self.virus = Virus(
-            infection_duration=self.infection_duration,
-            probability_of_infection_per_day=self.probability_of_infection_per_day
-        )
+        # Filled by the graphs drawing this simulation
+        self.graphs = []
 
-        self.cities = VGroup()
+        # The whole model runs in the engine, this only renders its state
+        self.engine = self._create_engine(config, height)
+        self.population_state = self.engine.population_state
+
+        # Sampled once for all the graphs, and kept for the whole run
+        self.stats_recorder = StatsRecorder(
+            self.engine, sample_interval=config['update_frequency'])
 
-        # For some reason this had to be set up in her otherwise the animation wont work
-        self.add_updater(lambda obj, dt: obj._update_statuses(dt))
+        # Interventions, added by the scenes
+        self.policy_scheduler = PolicyScheduler(self.engine)
+        self.engine.policy_scheduler = self.policy_scheduler
+
+        self.cities = VGroup()
 
         self._add_cities()
+
+        # The engine scales the cities and the positions to the height,
+        # the people are drawn scaled the same way
+        lower_bounds, upper_bounds = self.engine.city_bounds
+        self.drawn_radius = self.radius / 2 * \
+            (upper_bounds[0, 1] - lower_bounds[0, 1]) / config['city_size']
+
+        self.aggregated = self._should_aggregate(
+            config['aggregate_cities'], pixel_size)
+
         self._populate_cities()
-        self._infect_random_person()
+
+        self.add_updater(
+            lambda obj, dt: obj._update_engine(dt), call_updater=False)
+
+    def _create_engine(self, config, height):
+        if config['number_of_workers'] > 0:
+            engine = ParallelSimulationEngine(
+                config=config, height=height, number_of_workers=config['number_of_workers'])
+        else:
+            engine = SimulationEngine(config=config, height=height)
+
+        if config['trajectory_path'] is not None:
+            engine.record_trajectory(config['trajectory_path'])
+
+        return engine
 
     def _add_cities(self):
         self.cities = VGroup()
 
-        for x in range(self.number_of_cities):
-            self.cities.add(City(
-                city_size=self.city_size,
-                population=self.population,
-                person_config={
-                    'radius': self.radius,
-                    'colors_set': self.colors_set,
-                    'infection_radius': self.infection_radius,
-                    'wall_buffer': self.wall_buffer,
-                    'wander_step_size': self.wander_step_size,
-                    'wander_step_duration': self.wander_step_duration,
-                    'gravity_strength': self.gravity_strength,
-                    'social_distance_factor': self.social_distance_factor,
-                    'repel_from_max_number_of_people': self.repel_from_max_number_of_people,
-                    'max_speed': self.max_speed,
-                    'p_symptomatic_on_infection': self.p_symptomatic_on_infection
-                }
-            ))
-
-        self.cities.arrange_in_grid(buff=LARGE_BUFF)
-        self.cities.set_height(self.height)
+        lower_bounds, upper_bounds = self.engine.city_bounds
+
+        for center, lower, upper in zip(self.engine.city_centers, lower_bounds, upper_bounds):
+            city = City(
+                city_size=upper[1] - lower[1],
+                colors_set=self.colors_set
+            )
+            city.move_to(center)
+
+            self.cities.add(city)
 
         width, height = self.cities.get_width(), self.cities.get_height()
         margin = np.array(
@@ -91,117 +92,215 @@ class Simulation(VGroup):
         self.cities.move_to(
             self.position + margin)
 
+        # The engine lays the cities out around the origin
+        self.offset = self.cities.get_center()
+
         self.add(self.cities)
 
+    def _should_aggregate(self, aggregate_cities, pixel_size):
+        if aggregate_cities is not None:
+            return aggregate_cities
+
+        if pixel_size is None:
+            return False
+
+        # With hundreds of cities, the people end up smaller than a pixel
+        return self.drawn_radius < pixel_size
+
     def _populate_cities(self):
-        for city in self.cities:
-            city.populate()
+        population = self.population_state
+
+        self.rendered_positions = population.positions + self.offset
+
+        # All the people are drawn at once, aggregated cities draw their stats instead
+        self.population_mobject = PopulationMobject(
+            self.rendered_positions if not self.aggregated else np.zeros((0, 3)),
+            radius=self.drawn_radius,
+            color=self.colors_set['S'],
+        )
+
+        if not self.aggregated:
+            self.population_mobject.set_ring_radii(population.infection_radii)
+
+        self.add(self.population_mobject)
+
+        self.color_transitions = ColorTransitions(
+            self.population_mobject, duration=self.status_change_run_time)
 
-    def _infect_random_person(self):
-        random_city = random.choice(self.cities)
-        random_person = random.choice(random_city.people)
+        # Everyone is drawn as susceptible at first,
+        # so the first infection is animated too
+        self.rendered_statuses = np.zeros_like(population.statuses)
 
-        random_person.set_status('I')
+        # Where the running status change animations started from, for the checkpoints
+        self.status_change_start_statuses = np.zeros_like(population.statuses)
+        self.status_change_start_times = np.full(len(population), np.nan)
+
+        self.rendered_city_stats = np.zeros_like(population.status_counts)
+
+        # Per status, the color and the ring opacity
+        self.status_rgbas = np.array(
+            [color_to_rgba(self.colors_set[status]) for status in STATUSES])
+        self.status_ring_opacities = np.array(
+            [1 if status == 'I' else 0 for status in STATUSES])
+
+        if self.aggregated:
+            self._render_city_stats()
+
+    def _get_status_rgbas(self, indices):
+        # Infected people without symptoms have their own color
+        population = self.population_state
+        statuses = population.statuses[indices]
+
+        rgbas = self.status_rgbas[statuses]
+        rgbas[(statuses == INFECTED) & ~population.symptomatic[indices]] = \
+            color_to_rgba(self.colors_set['A'])
+
+        return rgbas
 
     def _update_time(self, delta_time):
         self.time += delta_time
 
-    def _update_statuses(self, delta_time):
-        for slider in self.sliders:
-            if slider.is_animating:
-                return
+    def _update_engine(self, delta_time):
+        update_statuses = not any(
+            slider.is_animating for slider in self.sliders or [])
+
+        self.engine.advance(delta_time, update_statuses=update_statuses)
+        self.stats_recorder.update(self.time)
 
-        for city in self.cities:
-            susceptible_people = list(
-                filter(lambda person: person.status == 'S', city.people))
-            infected_people = list(
-                filter(lambda person: person.status == 'I', city.people))
-            recovered_people = list(
-                filter(lambda person: person.status == 'I', city.people))
+        self._render()
 
-            for infected_person in infected_people:
-                for susceptible_person in susceptible_people:
-                    dist_between_the_two = get_norm(
-                        infected_person.get_center() - susceptible_person.get_center())
+    def _render(self):
+        if self.aggregated:
+            self._render_city_stats()
+        else:
+            self._render_statuses()
+            self.color_transitions.update(self.time)
+            self._render_positions()
 
-                    if dist_between_the_two < infected_person.infection_radius and random.random() < self.virus.probability_of_infection_per_day:
-                        susceptible_person.set_status('I')
+    def _render_city_stats(self):
+        city_stats = self.engine.get_city_stats()
+        changed_indices = np.flatnonzero(
+            np.any(city_stats != self.rendered_city_stats, axis=1))
 
-                if (infected_person.time - infected_person.infection_start_time) > self.virus.infection_duration:
-                    infected_person.set_status('R')
+        for index in changed_indices:
+            self.cities[index].show_stats(city_stats[index])
+
+        self.rendered_city_stats[changed_indices] = city_stats[changed_indices]
+
+    def _render_statuses(self):
+        statuses = self.population_state.statuses
+        changed_indices = np.flatnonzero(statuses != self.rendered_statuses)
+
+        self._show_status_changes(
+            changed_indices, self.rendered_statuses[changed_indices], self.time)
+
+        self.status_change_start_statuses[changed_indices] = self.rendered_statuses[changed_indices]
+        self.status_change_start_times[changed_indices] = self.time
+
+        self.rendered_statuses[changed_indices] = statuses[changed_indices]
+
+    def _show_status_changes(self, indices, start_statuses, start_times):
+        # The statuses are already set in the population state,
+        # this only animates the people towards them
+        self.color_transitions.start(
+            indices,
+            self.status_rgbas[start_statuses],
+            self._get_status_rgbas(indices),
+            self.status_ring_opacities[start_statuses],
+            self.status_ring_opacities[self.population_state.statuses[indices]],
+            start_times
+        )
 
-                for person in susceptible_people + infected_people:
-                    person.repel_from_people = []
+    def _render_positions(self):
+        # Shifted by how much people moved, so moving the whole simulation still works
+        positions = self.engine.get_render_positions() + self.offset
 
-                    if person.social_distance_factor > 0:
-                        repel_from_people = infected_people if self.limit_social_distancing_to_infectious else infected_people + susceptible_people
-                        repel_from_people_positions = np.array(
-                            list(map(lambda x: x.get_center(), repel_from_people)))
+        self.population_mobject.points += positions - self.rendered_positions
 
-                        distances_from_all_repel_people = np.linalg.norm(
-                            repel_from_people_positions - person.get_center(), axis=1)
+        self.rendered_positions[:] = positions
 
-                        person.repel_from_people = repel_from_people_positions[np.argsort(
-                            distances_from_all_repel_people)[1:person.repel_from_max_number_of_people + 1]]
+    def save_checkpoint(self, path):
+        checkpoint = self.engine.get_checkpoint()
 
-                    if self.travel_rate > 0 and len(self.cities) > 1:
-                        path_func = path_along_arc(45 * DEGREES)
+        checkpoint['simulation_time'] = self.time
+        checkpoint['status_change_start_statuses'] = self.status_change_start_statuses
+        checkpoint['status_change_start_times'] = self.status_change_start_times
 
-                        if random.random() < self.travel_rate * delta_time:
-                            travel_to_city = random.choice(
-                                [city_to for city_to in self.cities if city_to != city])
+        for name, array in self.stats_recorder.get_arrays().items():
+            checkpoint['stats_' + name] = array
 
-                            # remove person for the old city
-                            city.people.remove(person)
+        checkpoint.update(self.policy_scheduler.get_checkpoint())
 
-                            # add the person to the next city
-                            travel_to_city.people.add(person)
+        np.savez_compressed(path, **checkpoint)
 
-                            person.city_bounds = travel_to_city.bounds
+    def load_checkpoint(self, path):
+        with np.load(path) as checkpoint:
+            checkpoint = dict(checkpoint)
 
-                            old_center = person.get_center()
+        self.engine.load_checkpoint(checkpoint)
 
-                            person.add_animation(
-                                UpdateFromAlphaFunc(
-                                    person,
-                                    lambda m, p: m.travel_to(path_func(
-                                        old_center, travel_to_city.position, p,
-                                    ), p),
-                                    run_time=1,
-                                )
-                            )
+        self.time = float(checkpoint['simulation_time'])
+        self.status_change_start_statuses[:] = checkpoint['status_change_start_statuses']
+        self.status_change_start_times[:] = checkpoint['status_change_start_times']
 
-                for person in recovered_people:
-                    person.repel_from_people = []
+        self.stats_recorder.set_arrays({
+            name[len('stats_'):]: array
+            for name, array in checkpoint.items() if name.startswith('stats_')
+        })
+
+        self.policy_scheduler.load_checkpoint(checkpoint)
+
+        for graph in self.graphs:
+            graph.redraw()
+
+        self._render_checkpoint()
+
+    def _render_checkpoint(self):
+        statuses = self.population_state.statuses
+
+        # Snaps everyone to their status, dropping the running transitions
+        self.color_transitions.clear()
+
+        if not self.aggregated:
+            self.population_mobject.set_rgbas(
+                self._get_status_rgbas(slice(None)))
+            self.population_mobject.set_ring_opacities(
+                self.status_ring_opacities[statuses])
+
+            # Start again the status changes that were still running
+            running_indices = np.flatnonzero(
+                self.time - self.status_change_start_times < self.status_change_run_time)
+
+            self._show_status_changes(
+                running_indices,
+                self.status_change_start_statuses[running_indices],
+                self.status_change_start_times[running_indices]
+            )
+
+        self.rendered_statuses[:] = statuses
+        self._render()
+
+    def save_transmission_log(self, path):
+        # Along with the S/I/R series
+        self.engine.transmission_log.save(
+            path, stats=self.stats_recorder.get_status_fractions(),
+            stats_times=self.stats_recorder.get('times'))
+
+    def save_stats(self, path):
+        self.stats_recorder.save(path)
+
+    def close(self):
+        self.engine.close()
 
     def get_stats(self):
-        total_susceptible_people = 0
-        total_infected_people = 0
-        total_recovered_people = 0
-
-        for city in self.cities:
-            total_susceptible_people += len(list(
-                filter(lambda person: person.status == 'S', city.people)))
-            total_infected_people += len(list(
-                filter(lambda person: person.status == 'I', city.people)))
-            total_recovered_people += len(list(
-                filter(lambda person: person.status == 'R', city.people)))
-
-        return np.array([
-            total_susceptible_people,
-            total_infected_people,
-            total_recovered_people
-        ])
+        return self.engine.get_stats()
 
     def get_averaged_stats(self):
-        stats = self.get_stats()
-
-        return stats / sum(stats)
+        return self.engine.get_averaged_stats()
 
-    def change_social_distance_factor(self, new_value, social_distancing_probability):
-        self.social_distance_factor = new_value
+    def get_city_stats(self):
+        return self.engine.get_city_stats()
 
-        for city in self.cities:
-            for person in city.people:
-                if random.random() < social_distancing_probability:
-                    person.social_distance_factor = new_value
+    def change_social_distance_factor(self, new_value, social_distancing_probability, indices=None):
+        return self.engine.change_social_distance_factor(
+            new_value, social_distancing_probability, indices)
@@ -0,0 +1,27 @@
+import numpy as np
+
+
+class SimulationClock:
+    # Leftovers this close to a full step still count as one,
+    # so 1/15 of a second is exactly 4 steps of 1/60
+    TOLERANCE = 1e-9
+
+    def __init__(self, time_step=1 / 60):
+        self.time_step = time_step
+        self.accumulator = 0
+
+    def advance(self, delta_time):
+        # How many fixed steps fit in the time that passed,
+        # the rest is carried over to the next call
+        self.accumulator += delta_time
+
+        number_of_steps = int(
+            np.floor(self.accumulator / self.time_step + self.TOLERANCE))
+        self.accumulator = max(
+            self.accumulator - number_of_steps * self.time_step, 0)
+
+        return number_of_steps
+
+    def get_alpha(self):
+        # How far the render time is between the last two steps
+        return min(self.accumulator / self.time_step, 1)
@@ -0,0 +1,646 @@
+import numpy as np
+from app.modules.virus import Virus
+from app.modules.population_state import PopulationState, SUSCEPTIBLE, INFECTED, RECOVERED
+from app.modules.spatial_hash import SpatialHash, get_pairs_within_radius, get_distances
+from app.modules.nearest_neighbours import get_nearest_neighbours
+from app.modules.neighbour_list import NeighbourList
+from app.modules.motion import MotionIntegrator
+from app.modules.simulation_clock import SimulationClock
+from app.modules.recovery_scheduler import RecoveryScheduler
+from app.modules.trajectory import TrajectoryRecorder
+from app.modules.transmission_log import TransmissionLog
+from app.modules.travel_network import TravelNetwork, get_uniform_travel_matrix, get_gravity_travel_matrix, load_travel_matrix
+
+
+# Same spacing as VGroup.arrange_in_grid(buff=LARGE_BUFF)
+CITIES_BUFF = 1
+
+TRAVEL_ARC_ANGLE = np.pi / 4
+TRAVEL_DURATION = 1
+
+INFECTION_MODELS = ('per_contact', 'per_neighbour_count')
+
+# Bumped whenever the content of the checkpoints changes
+CHECKPOINT_VERSION = 3
+
+
+def get_arc_positions(start_points, end_points, alphas, arc_angle=TRAVEL_ARC_ANGLE):
+    # Vectorized path_along_arc around the z axis, one alpha per point
+    vects = end_points - start_points
+    centers = start_points + .5 * vects
+    centers[:, 0] -= vects[:, 1] / 2 / np.tan(arc_angle / 2)
+    centers[:, 1] += vects[:, 0] / 2 / np.tan(arc_angle / 2)
+
+    angles = alphas * arc_angle
+    cos, sin = np.cos(angles), np.sin(angles)
+    x, y = (start_points - centers)[:, 0], (start_points - centers)[:, 1]
+
+    return centers + np.stack([x * cos - y * sin, x * sin + y * cos, np.zeros(len(x))], axis=1)
+
+
+class SimulationEngine:
+    def __init__(self, config={}, height=None, seed=None, population_state=None):
+        self.number_of_cities = config['number_of_cities']
+        self.city_size = config['city_size']
+        self.population = config['population']
+
+        # Social Distancing
+        self.limit_social_distancing_to_infectious = config['limit_social_distancing_to_infectious']
+        self.social_distance_factor = config['social_distance_factor']
+        self.repel_from_max_number_of_people = config['repel_from_max_number_of_people']
+
+        # Person config
+        self.infection_radius = config['infection_radius']
+        self.p_symptomatic_on_infection = config['p_symptomatic_on_infection']
+        self.max_speed = config['max_speed']
+
+        # Travel config
+        self.travel_rate = config['travel_rate']
+
+        # Use a grid to find the people in the infection radius,
+        # disabling it falls back to testing every pair
+        self.use_spatial_hash = config['use_spatial_hash']
+
+        # Keep the pairs closer than the cutoff plus a skin between the steps,
+        # only rebuilt once someone moved more than half the skin
+        self.neighbour_list = None
+
+        # A cutoff under the infection radius would silently miss exposures
+        if config['neighbour_list_cutoff'] is not None and \
+                config['neighbour_list_cutoff'] < self.infection_radius:
+            raise Exception("Neighbour list cutoff {} is smaller than the infection radius {}".format(
+                config['neighbour_list_cutoff'], self.infection_radius))
+
+        if config['neighbour_list_skin'] > 0:
+            self.neighbour_list = NeighbourList(
+                cutoff=config['neighbour_list_cutoff'] or self.infection_radius,
+                skin=config['neighbour_list_skin']
+            )
+
+        # Cross check the maintained counts against a full scan
+        self.debug_stats = config['debug_stats']
+
+        if config['infection_model'] not in INFECTION_MODELS:
+            raise Exception("Unknown infection model {}, expected one of {}".format(
+                config['infection_model'], INFECTION_MODELS))
+
+        self.infection_model = config['infection_model']
+
+        self.time = 0
+
+        # The model always moves by the same fixed step,
+        # whatever the frame rate it is rendered at
+        self.clock = SimulationClock(time_step=config['time_step'])
+        self.interpolate_positions = config['interpolate_positions']
+        self.previous_positions = None
+
+        # Writes every step to disk once record_trajectory is called
+        self.trajectory_recorder = None
+
+        # Evaluates the interventions on every tick once set
+        self.policy_scheduler = None
+
+        # Without an explicit seed follow the global one, which the scenes set
+        if seed is None:
+            seed = np.random.randint(2 ** 31)
+
+        self.random_state = np.random.RandomState(seed)
+
+        self.virus = Virus(
+            infection_duration=config['infection_duration'],
+            probability_of_infection_per_day=config['probability_of_infection_per_day'],
+            infection_duration_deviation=config['infection_duration_deviation']
+        )
+
+        self.recovery_scheduler = RecoveryScheduler()
+
+        self.motion_integrator = MotionIntegrator(
+            wall_buffer=config['wall_buffer'],
+            wander_step_size=config['wander_step_size'],
+            wander_step_duration=config['wander_step_duration'],
+            gravity_strength=config['gravity_strength'],
+            random_state=self.random_state
+        )
+
+        # Who infected who
+        self.transmission_log = TransmissionLog(
+            self.number_of_cities * self.population)
+
+        self._add_cities(height)
+
+        self.travel_network = TravelNetwork(self._get_travel_matrix(config))
+
+        # A given population state is already populated,
+        # like the one a worker process shares with the main one
+        if population_state is None:
+            self.population_state = self._create_population_state()
+
+            self._populate_cities()
+            self._infect_random_person()
+        else:
+            self.population_state = population_state
+
+    def _create_population_state(self):
+        return PopulationState(
+            self.number_of_cities * self.population,
+            max_neighbours=self.repel_from_max_number_of_people,
+            number_of_cities=self.number_of_cities
+        )
+
+    def _add_cities(self, height):
+        # Lay the cities out in columns, the same way arrange_in_grid does,
+        # centered on the origin and scaled to the given height
+        number_of_cities = self.number_of_cities
+        cities_per_column = number_of_cities // int(np.sqrt(number_of_cities))
+        spacing = self.city_size + CITIES_BUFF
+
+        city_centers = np.zeros((number_of_cities, 3))
+
+        for column_index, first_city in enumerate(range(0, number_of_cities, cities_per_column)):
+            column = range(first_city, min(
+                first_city + cities_per_column, number_of_cities))
+
+            for row_index, city_index in enumerate(column):
+                city_centers[city_index, 0] = column_index * spacing
+                city_centers[city_index, 1] = (
+                    (len(column) - 1) / 2 - row_index) * spacing
+
+        city_centers -= (city_centers.min(axis=0) +
+                         city_centers.max(axis=0)) / 2
+
+        city_size = self.city_size
+
+        if height is not None:
+            scale_factor = height / \
+                (np.ptp(city_centers[:, 1]) + self.city_size)
+
+            city_centers *= scale_factor
+            city_size *= scale_factor
+
+        half_size = np.array([city_size / 2, city_size / 2, 0])
+
+        self.city_centers = city_centers
+        self.city_bounds = (city_centers - half_size, city_centers + half_size)
+
+    def _get_travel_matrix(self, config):
+        # 'uniform', 'gravity' or the path of a scipy.sparse .npz
+        travel_network = config['travel_network']
+
+        if travel_network == 'uniform':
+            return get_uniform_travel_matrix(self.number_of_cities)
+
+        if travel_network == 'gravity':
+            return get_gravity_travel_matrix(
+                self.city_centers,
+                np.full(self.number_of_cities, self.population),
+                distance_exponent=config['gravity_distance_exponent'],
+                number_of_destinations=config['gravity_number_of_destinations']
+            )
+
+        return load_travel_matrix(travel_network, self.number_of_cities)
+
+    def _populate_cities(self):
+        population = self.population_state
+
+        population.infection_radii[:] = self.infection_radius
+        population.max_speeds[:] = self.max_speed
+        population.social_distance_factors[:] = self.social_distance_factor
+
+        population.city_indices[:] = np.repeat(
+            np.arange(self.number_of_cities), self.population)
+        population.reset_status_counts()
+
+        lower, upper = (bounds[population.city_indices]
+                        for bounds in self.city_bounds)
+
+        population.positions[:] = lower + \
+            self.random_state.random_sample((len(population), 3)) * (upper - lower)
+
+    def _infect_random_person(self):
+        self._infect(np.array([self.random_state.randint(
+            len(self.population_state))]), np.array([-1]))
+
+    def _infect(self, infectees, infectors):
+        # Logs who infected who, the infector is -1 for the people infected at the start
+        population = self.population_state
+
+        distances = np.where(
+            infectors >= 0,
+            get_distances(population.positions[infectors],
+                          population.positions[infectees]),
+            np.nan
+        )
+
+        self.transmission_log.append(
+            infectors,
+            infectees,
+            np.full(len(infectees), self.time),
+            population.city_indices[infectees],
+            distances
+        )
+
+        self.set_status(infectees, 'I')
+
+    def set_status(self, indices, status):
+        population = self.population_state
+
+        population.set_status(indices, status, self.time)
+
+        if status == 'I':
+            population.symptomatic[indices] = self.random_state.random_sample(
+                np.shape(indices)) < self.p_symptomatic_on_infection
+
+            population.recovery_times[indices] = self.time + \
+                self.virus.get_infection_durations(
+                    np.shape(indices), self.random_state)
+
+            self.recovery_scheduler.schedule(
+                indices, population.recovery_times[indices])
+
+        if status == 'R':
+            population.repel_from_indices[indices] = -1
+
+    def advance(self, delta_time, update_statuses=True):
+        for _ in range(self.clock.advance(delta_time)):
+            # On the engine time, so an intervention starts on the same tick at any frame rate
+            if self.policy_scheduler is not None:
+                self.policy_scheduler.update(self.time)
+
+            if self.interpolate_positions:
+                self.previous_positions = self.population_state.positions.copy()
+
+            self.step(self.clock.time_step, update_statuses=update_statuses)
+
+            if self.trajectory_recorder is not None:
+                self.trajectory_recorder.record(self.time)
+
+    def record_trajectory(self, directory, chunk_size=256):
+        self.trajectory_recorder = TrajectoryRecorder(
+            directory, self, chunk_size=chunk_size)
+        self.trajectory_recorder.record(self.time)
+
+    def get_render_positions(self):
+        positions = self.population_state.positions
+
+        if not self.interpolate_positions or self.previous_positions is None:
+            return positions
+
+        alpha = self.clock.get_alpha()
+
+        return self.previous_positions + alpha * (positions - self.previous_positions)
+
+    def step(self, delta_time, update_statuses=True):
+        self.time += delta_time
+
+        if update_statuses:
+            self._update_statuses(delta_time)
+
+        self._update_travelers()
+
+        self.motion_integrator.step(
+            self.population_state, self.city_bounds, self.time, delta_time)
+
+    def _update_statuses(self, delta_time):
+        grouped_indices, group_starts = self._group_by_city()
+
+        self._infect(*self._update_cities(
+            np.arange(self.number_of_cities), grouped_indices, group_starts,
+            delta_time, self._is_social_distancing()))
+
+        self._update_travel(delta_time)
+        self._update_recoveries()
+
+    def _group_by_city(self):
+        # Everyone sorted by city, the people of city c being
+        # grouped_indices[group_starts[c]:group_starts[c + 1]]
+        city_indices = self.population_state.city_indices
+
+        grouped_indices = np.argsort(city_indices, kind='mergesort')
+        group_starts = np.searchsorted(
+            city_indices[grouped_indices], np.arange(self.number_of_cities + 1), side='left')
+
+        return grouped_indices, group_starts
+
+    def _is_social_distancing(self):
+        population = self.population_state
+
+        return population.max_neighbours > 0 and bool(np.any(population.social_distance_factors > 0))
+
+    def _update_cities(self, city_indices, grouped_indices, group_starts, delta_time, social_distancing):
+        # Infection and social distancing inside each city, the people of city_indices[k]
+        # being grouped_indices[group_starts[k]:group_starts[k + 1]].
+        # Only reads the people of the given cities, the new infections
+        # and their infectors are returned for _infect
+        population = self.population_state
+
+        statuses = population.statuses[grouped_indices]
+        starts, ends = group_starts[:-1], group_starts[1:]
+
+        # The nearest neighbours are searched city by city, with a k-d tree and not the
+        # neighbour list: the k nearest people can be further than any cutoff,
+        # and a list limited to the infection radius would push away from fewer people
+        if social_distancing:
+            for start, end in zip(starts, ends):
+                people_statuses = statuses[start:end]
+                people_indices = grouped_indices[start:end]
+
+                self._update_repel_from_people(
+                    people_indices[people_statuses == SUSCEPTIBLE],
+                    people_indices[people_statuses == INFECTED])
+
+        # Only the cities with infected people have something to do,
+        # their people are then handled all at once
+        infected = np.concatenate([[0], np.cumsum(statuses == INFECTED)])
+        has_infected = infected[ends] > infected[starts]
+        city_indices, starts, ends = city_indices[has_infected], starts[has_infected], ends[has_infected]
+
+        sizes = ends - starts
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+        grouped_positions = np.repeat(starts - offsets[:-1], sizes) + np.arange(offsets[-1])
+
+        people_indices = grouped_indices[grouped_positions]
+        statuses = statuses[grouped_positions]
+
+        if self.neighbour_list is not None:
+            # The lists are kept per city
+            pairs = [
+                self.neighbour_list.get_exposure_pairs(
+                    city_index,
+                    people_indices[offset:next_offset],
+                    population.positions,
+                    statuses[offset:next_offset] == INFECTED,
+                    statuses[offset:next_offset] == SUSCEPTIBLE,
+                    population.infection_radii
+                )
+                for city_index, offset, next_offset in zip(city_indices, offsets[:-1], offsets[1:])
+            ]
+
+            infector_indices = np.concatenate(
+                [np.zeros(0, dtype=np.int64)] + [infectors for infectors, _ in pairs])
+            exposed_indices = np.concatenate(
+                [np.zeros(0, dtype=np.int64)] + [exposed for _, exposed in pairs])
+        else:
+            infector_indices, exposed_indices = self._get_exposure_pairs(
+                people_indices[statuses == INFECTED], people_indices[statuses == SUSCEPTIBLE])
+
+        # The draws do not depend on how the pairs were found
+        order = np.lexsort((exposed_indices, infector_indices))
+        infector_indices, exposed_indices = infector_indices[order], exposed_indices[order]
+
+        probability = self.virus.get_step_probability(delta_time)
+
+        if self.infection_model == 'per_contact':
+            # Every infected neighbour is a trial of its own
+            infecting = self.random_state.random_sample(
+                len(exposed_indices)) < probability
+        else:
+            # One trial per exposed person, k infected neighbours give 1 - (1 - p)^k
+            exposed_people, inverse, counts = np.unique(
+                exposed_indices, return_inverse=True, return_counts=True)
+            infected = self.random_state.random_sample(
+                len(exposed_people)) < 1 - (1 - probability) ** counts
+            infecting = infected[inverse]
+
+        return self._get_closest_infectors(
+            infector_indices[infecting], exposed_indices[infecting])
+
+    def _get_closest_infectors(self, infector_indices, infectee_indices):
+        # One infector per infectee, the closest one of their pairs
+        positions = self.population_state.positions
+
+        distances = get_distances(
+            positions[infector_indices], positions[infectee_indices])
+        order = np.lexsort((distances, infectee_indices))
+
+        infectee_indices, first_pairs = np.unique(
+            infectee_indices[order], return_index=True)
+
+        return infectee_indices, infector_indices[order][first_pairs]
+
+    def _update_recoveries(self):
+        population = self.population_state
+
+        indices, recovery_times = self.recovery_scheduler.pop_due(self.time)
+
+        # People infected again since they were scheduled have a newer entry
+        scheduled = (population.statuses[indices] == INFECTED) & \
+            (population.recovery_times[indices] == recovery_times)
+
+        self.set_status(indices[scheduled], 'R')
+
+    def _get_exposure_pairs(self, infected_indices, susceptible_indices):
+        # Every (infected, susceptible) pair of the same city in the infection radius
+        population = self.population_state
+
+        infected_positions = population.positions[infected_indices]
+        susceptible_positions = population.positions[susceptible_indices]
+        infection_radii = population.infection_radii[infected_indices]
+
+        infected_cities = population.city_indices[infected_indices]
+        susceptible_cities = population.city_indices[susceptible_indices]
+
+        if len(infected_indices) == 0 or len(susceptible_indices) == 0:
+            pairs = (np.zeros(0, dtype=int), np.zeros(0, dtype=int))
+        elif self.use_spatial_hash:
+            # One grid for all the cities, keyed by city as well
+            spatial_hash = SpatialHash(cell_size=infection_radii.max())
+            spatial_hash.build(susceptible_positions, susceptible_cities)
+
+            pairs = spatial_hash.get_pairs_within_radius(
+                infected_positions, infection_radii, infected_cities)
+        else:
+            # Testing every pair, city by city
+            city_pairs = []
+
+            for city_index in np.unique(infected_cities):
+                city_infected = np.flatnonzero(infected_cities == city_index)
+                city_susceptible = np.flatnonzero(susceptible_cities == city_index)
+
+                infected, susceptible = get_pairs_within_radius(
+                    infected_positions[city_infected], susceptible_positions[city_susceptible],
+                    infection_radii[city_infected])
+
+                city_pairs.append((city_infected[infected], city_susceptible[susceptible]))
+
+            pairs = (np.concatenate([np.zeros(0, dtype=int)] + [infected for infected, _ in city_pairs]),
+                     np.concatenate([np.zeros(0, dtype=int)] + [susceptible for _, susceptible in city_pairs]))
+
+        infected, susceptible = pairs
+
+        return infected_indices[infected], susceptible_indices[susceptible]
+
+    def _update_repel_from_people(self, susceptible_indices, infected_indices):
+        population = self.population_state
+
+        people_indices = np.concatenate([susceptible_indices, infected_indices])
+        population.repel_from_indices[people_indices] = -1
+
+        repel_from_indices = infected_indices if self.limit_social_distancing_to_infectious else np.concatenate(
+            [infected_indices, susceptible_indices])
+
+        # Only the people that are social distancing look for their neighbours
+        people_indices = people_indices[population.social_distance_factors[people_indices] > 0]
+
+        population.repel_from_indices[people_indices] = get_nearest_neighbours(
+            population.positions[repel_from_indices],
+            repel_from_indices,
+            population.positions[people_indices],
+            people_indices,
+            self.repel_from_max_number_of_people
+        )
+
+    def _update_travel(self, delta_time):
+        if self.travel_rate == 0 or self.number_of_cities == 1:
+            return
+
+        population = self.population_state
+
+        # Recovered people and people already on the road stay where they are
+        candidates = np.flatnonzero(
+            (population.statuses != RECOVERED) & ~population.traveling &
+            self.travel_network.has_destinations[population.city_indices])
+
+        leaving = candidates[self.random_state.random_sample(
+            len(candidates)) < min(self.travel_rate * delta_time, 1)]
+
+        if len(leaving) == 0:
+            return
+
+        self._travel(leaving, self.travel_network.sample_destinations(
+            population.city_indices[leaving], self.random_state))
+
+    def _travel(self, indices, travel_to_city_indices):
+        population = self.population_state
+
+        population.set_city(indices, travel_to_city_indices)
+        population.traveling[indices] = True
+        population.travel_start_times[indices] = self.time
+        population.travel_origins[indices] = population.positions[indices]
+
+    def _update_travelers(self):
+        population = self.population_state
+        travelers = np.flatnonzero(population.traveling)
+
+        if len(travelers) == 0:
+            return
+
+        progress = np.minimum(
+            (self.time - population.travel_start_times[travelers]) / TRAVEL_DURATION, 1)
+
+        population.positions[travelers] = get_arc_positions(
+            population.travel_origins[travelers],
+            self.city_centers[population.city_indices[travelers]],
+            progress
+        )
+
+        population.traveling[travelers[progress >= 1]] = False
+
+    def get_stats(self):
+        if self.debug_stats:
+            self.population_state.check_status_counts()
+
+        return self.population_state.status_totals.copy()
+
+    def get_city_stats(self):
+        if self.debug_stats:
+            self.population_state.check_status_counts()
+
+        return self.population_state.status_counts.copy()
+
+    def get_averaged_stats(self):
+        stats = self.get_stats()
+
+        return stats / sum(stats)
+
+    def get_checkpoint(self):
+        # Everything needed to carry on from this step, as arrays
+        population = self.population_state
+        _, keys, position, has_gauss, cached_gaussian = self.random_state.get_state()
+
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'time': self.time,
+            'clock_accumulator': self.clock.accumulator,
+            'social_distance_factor': self.social_distance_factor,
+            # Policies can change it during the run
+            'travel_rate': self.travel_rate,
+            'random_state_keys': keys,
+            'random_state_position': position,
+            'random_state_has_gauss': has_gauss,
+            'random_state_cached_gaussian': cached_gaussian,
+            # (recovery time, index) rows, in heap order
+            'recovery_queue': np.array(self.recovery_scheduler.queue, dtype=np.float64).reshape(-1, 2),
+        }
+
+        if self.previous_positions is not None:
+            checkpoint['previous_positions'] = self.previous_positions.copy()
+
+        # Copies, the next step writes the population and the log in place
+        for name in PopulationState.FIELDS:
+            checkpoint['population_' + name] = getattr(population, name).copy()
+
+        for name, values in self.transmission_log.get_arrays().items():
+            checkpoint['transmission_' + name] = values.copy()
+
+        return checkpoint
+
+    def load_checkpoint(self, checkpoint):
+        population = self.population_state
+
+        if checkpoint['version'] != CHECKPOINT_VERSION:
+            raise Exception("Checkpoint version {} is not supported, expected {}".format(
+                checkpoint['version'], CHECKPOINT_VERSION))
+
+        if len(checkpoint['population_statuses']) != len(population):
+            raise Exception("Checkpoint population {} does not match the simulation population {}".format(
+                len(checkpoint['population_statuses']), len(population)))
+
+        self.time = float(checkpoint['time'])
+        self.clock.accumulator = float(checkpoint['clock_accumulator'])
+        self.social_distance_factor = float(
+            checkpoint['social_distance_factor'])
+        self.travel_rate = float(checkpoint['travel_rate'])
+
+        self.random_state.set_state((
+            'MT19937',
+            checkpoint['random_state_keys'],
+            int(checkpoint['random_state_position']),
+            int(checkpoint['random_state_has_gauss']),
+            float(checkpoint['random_state_cached_gaussian'])
+        ))
+
+        self.recovery_scheduler.queue = [
+            (recovery_time, int(index)) for recovery_time, index in checkpoint['recovery_queue']
+        ]
+
+        self.previous_positions = checkpoint['previous_positions'].copy() \
+            if 'previous_positions' in checkpoint else None
+
+        # Written in place, the people and the worker processes keep views on these arrays
+        for name in PopulationState.FIELDS:
+            getattr(population, name)[:] = checkpoint['population_' + name]
+
+        population.reset_status_counts()
+
+        self.transmission_log.set_arrays({
+            name: checkpoint['transmission_' + name] for name in TransmissionLog.FIELDS})
+
+    def close(self):
+        if self.trajectory_recorder is not None:
+            self.trajectory_recorder.close()
+
+    def change_social_distance_factor(self, new_value, social_distancing_probability, indices=None):
+        # Everyone, or only the given people, complies with the given probability
+        self.social_distance_factor = new_value
+
+        population = self.population_state
+
+        if indices is None:
+            indices = np.arange(len(population))
+
+        complying = self.random_state.random_sample(
+            len(indices)) < social_distancing_probability
+
+        population.social_distance_factors[indices[complying]] = new_value
+
+        return indices[complying]
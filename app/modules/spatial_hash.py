@@ -0,0 +1,108 @@
+import numpy as np
+
+
+# Offsets of a cell and its 8 neighbours
+NEIGHBOUR_CELL_OFFSETS = np.array([
+    [x, y] for x in (-1, 0, 1) for y in (-1, 0, 1)
+])
+
+# Cell coordinates stay well below 2 ** 31, so this keeps the keys unique
+CELL_KEY_MULTIPLIER = 2 ** 32
+
+# With groups, the cell coordinates and the groups have to stay below 2 ** 20
+GROUPED_CELL_KEY_MULTIPLIER = 2 ** 21
+GROUP_KEY_MULTIPLIER = 2 ** 42
+
+
+def get_distances(from_positions, to_positions):
+    return np.linalg.norm(to_positions - from_positions, axis=-1)
+
+
+def get_pairs_within_radius(query_positions, positions, radii):
+    # Brute force reference, tests every query against every position
+    radii = np.broadcast_to(radii, len(query_positions))
+
+    distances = get_distances(query_positions[:, None], positions[None])
+    query_indices, indices = np.nonzero(distances < radii[:, None])
+
+    return query_indices, indices
+
+
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size if cell_size > 0 else 1
+
+        self.positions = np.zeros((0, 3))
+        self.order = np.zeros(0, dtype=int)
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.starts = np.zeros(0, dtype=int)
+        self.counts = np.zeros(0, dtype=int)
+
+    def _get_cells(self, positions):
+        return np.floor(positions[..., :2] / self.cell_size).astype(np.int64)
+
+    def _get_keys(self, cells, groups=None):
+        if groups is None:
+            return cells[..., 0] * CELL_KEY_MULTIPLIER + cells[..., 1]
+
+        # Positions of different groups never share a cell
+        return np.asarray(groups, dtype=np.int64) * GROUP_KEY_MULTIPLIER + \
+            cells[..., 0] * GROUPED_CELL_KEY_MULTIPLIER + cells[..., 1]
+
+    def build(self, positions, groups=None):
+        # Only positions of the same group, like the people of a city, are paired
+        self.positions = positions
+
+        keys = self._get_keys(self._get_cells(positions), groups)
+
+        # Bucket the positions by sorting them by their cell key
+        self.order = np.argsort(keys, kind='mergesort')
+        self.keys, self.starts, self.counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True)
+
+        return self
+
+    def get_candidate_pairs(self, query_positions, query_groups=None):
+        if len(self.keys) == 0 or len(query_positions) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+        neighbour_cells = self._get_cells(query_positions)[:, None] + \
+            NEIGHBOUR_CELL_OFFSETS[None]
+        neighbour_keys = self._get_keys(
+            neighbour_cells, None if query_groups is None else np.asarray(query_groups)[:, None]).ravel()
+
+        slots = np.searchsorted(self.keys, neighbour_keys)
+        slots[slots == len(self.keys)] = 0
+        found = self.keys[slots] == neighbour_keys
+
+        query_indices = np.repeat(
+            np.arange(len(query_positions)), len(NEIGHBOUR_CELL_OFFSETS))[found]
+        starts = self.starts[slots[found]]
+        counts = self.counts[slots[found]]
+
+        # Expand every (query, cell) match into one pair per bucketed position
+        offsets = np.arange(counts.sum()) - \
+            np.repeat(np.cumsum(counts) - counts, counts)
+        indices = self.order[np.repeat(starts, counts) + offsets]
+
+        return np.repeat(query_indices, counts), indices
+
+    def get_pairs_within_radius(self, query_positions, radii, query_groups=None):
+        # The radii must not be bigger than the cell size,
+        # otherwise the 3x3 neighbourhood misses some pairs
+        radii = np.broadcast_to(radii, len(query_positions))
+
+        query_indices, indices = self.get_candidate_pairs(
+            query_positions, query_groups)
+
+        distances = get_distances(
+            query_positions[query_indices], self.positions[indices])
+        within_radius = distances < radii[query_indices]
+
+        query_indices = query_indices[within_radius]
+        indices = indices[within_radius]
+
+        # Same ordering as the brute force path
+        order = np.lexsort((indices, query_indices))
+
+        return query_indices[order], indices[order]
@@ -0,0 +1,126 @@
+import csv
+import numpy as np
+from app.modules.population_state import STATUSES, INFECTED
+
+
+class StatsRecorder:
+    # name: dtype, one row per sample
+    FIELDS = {
+        'times': np.float64,
+        # Counts per status, in the order of STATUSES
+        'stats': np.int64,
+        # Infected people without symptoms
+        'asymptomatic': np.int64,
+        # Counts per city and status
+        'city_stats': np.int64,
+    }
+
+    def __init__(self, engine, sample_interval=1 / 15, capacity=1024):
+        # Samples the engine once for everything drawing or saving its stats
+        self.engine = engine
+        self.population_state = engine.population_state
+        self.sample_interval = sample_interval
+
+        self.size = 0
+        self.last_sample_time = -1
+
+        number_of_cities = len(self.population_state.status_counts)
+
+        self.shapes = {
+            'times': (),
+            'stats': (len(STATUSES),),
+            'asymptomatic': (),
+            'city_stats': (number_of_cities, len(STATUSES)),
+        }
+
+        for name, dtype in self.FIELDS.items():
+            setattr(self, '_' + name, np.zeros(
+                (capacity, *self.shapes[name]), dtype=dtype))
+
+        self._sample(0)
+
+    def __len__(self):
+        return self.size
+
+    def get(self, name):
+        return getattr(self, '_' + name)[:self.size]
+
+    def update(self, time):
+        if (time - self.last_sample_time) > self.sample_interval:
+            self._sample(time)
+
+    def _sample(self, time):
+        population = self.population_state
+
+        self._append(
+            times=time,
+            stats=self.engine.get_stats(),
+            asymptomatic=np.count_nonzero(
+                (population.statuses == INFECTED) & ~population.symptomatic),
+            city_stats=self.engine.get_city_stats()
+        )
+
+        self.last_sample_time = time
+
+    def _append(self, **row):
+        # Grown by doubling, like the transmission log
+        capacity = len(self._times)
+
+        if self.size == capacity:
+            for name in self.FIELDS:
+                array = getattr(self, '_' + name)
+                grown = np.zeros((2 * capacity, *array.shape[1:]), dtype=array.dtype)
+                grown[:self.size] = array[:self.size]
+
+                setattr(self, '_' + name, grown)
+
+        for name, value in row.items():
+            getattr(self, '_' + name)[self.size] = value
+
+        self.size += 1
+
+    def get_status_fractions(self, start=0):
+        # Per sample, the shares of S, I and R
+        stats = self.get('stats')[start:]
+
+        return stats / stats.sum(axis=1, keepdims=True)
+
+    def get_arrays(self):
+        arrays = {name: self.get(name) for name in self.FIELDS}
+        arrays['last_sample_time'] = np.array(self.last_sample_time)
+
+        return arrays
+
+    def set_arrays(self, arrays):
+        self.size = len(arrays['times'])
+        capacity = max(self.size, len(self._times))
+
+        for name, dtype in self.FIELDS.items():
+            array = np.zeros((capacity, *self.shapes[name]), dtype=dtype)
+            array[:self.size] = arrays[name]
+
+            setattr(self, '_' + name, array)
+
+        self.last_sample_time = float(arrays['last_sample_time'])
+
+    def save(self, path):
+        # A .csv with one column per count, or the arrays as a .npz
+        if not path.endswith('.csv'):
+            np.savez_compressed(path, **self.get_arrays())
+            return
+
+        city_stats = self.get('city_stats')
+
+        header = ['time', *STATUSES, 'A'] + [
+            'city_{}_{}'.format(city_index, status)
+            for city_index in range(city_stats.shape[1])
+            for status in STATUSES
+        ]
+
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+
+            for time, stats, asymptomatic, counts in zip(
+                    self.get('times'), self.get('stats'), self.get('asymptomatic'), city_stats):
+                writer.writerow([time, *stats, asymptomatic, *counts.ravel()])
@@ -0,0 +1,204 @@
+import os
+import json
+import pickle
+import hashlib
+import itertools
+import numpy as np
+from multiprocessing import Pool, cpu_count
+from app.modules.population_state import INFECTED, RECOVERED
+from app.modules.ensemble import DEFAULT_HEIGHT, run_simulation
+
+# Part of every cache key, raise it when a change to the model
+# makes the cached results stale
+CACHE_VERSION = 2
+
+# Simulation attributes that only make sense as whole numbers
+INTEGER_ATTRIBUTES = (
+    'population',
+    'number_of_cities',
+    'repel_from_max_number_of_people',
+    'gravity_number_of_destinations',
+    'number_of_workers',
+)
+
+
+def get_grid_design(values):
+    # values: name -> list of values, every combination is a point
+    names = list(values)
+
+    return [
+        dict(zip(names, point))
+        for point in itertools.product(*(values[name] for name in names))
+    ]
+
+
+def get_random_design(ranges, number_of_points, random_state=np.random):
+    # ranges: name -> (low, high), uniformly drawn
+    return [
+        {
+            name: low + random_state.random_sample() * (high - low)
+            for name, (low, high) in ranges.items()
+        }
+        for _ in range(number_of_points)
+    ]
+
+
+def get_latin_hypercube_design(ranges, number_of_points, random_state=np.random):
+    # Every range is cut in number_of_points strata and each stratum is used once
+    columns = {}
+
+    for name, (low, high) in ranges.items():
+        strata = random_state.permutation(number_of_points)
+        alphas = (strata + random_state.random_sample(number_of_points)) / \
+            number_of_points
+
+        columns[name] = low + alphas * (high - low)
+
+    return [
+        {name: column[point_index] for name, column in columns.items()}
+        for point_index in range(number_of_points)
+    ]
+
+
+def get_file_hash(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def get_outcomes(samples, sample_interval):
+    infected = samples[:, INFECTED]
+
+    return {
+        'peak_infected': infected.max(),
+        'time_to_peak': infected.argmax() * sample_interval,
+        'final_recovered': samples[-1, RECOVERED],
+    }
+
+
+def _run_simulation(args):
+    key, run_args = args
+
+    return key, run_simulation(*run_args)
+
+
+class Sweep:
+    def __init__(self, scene_class, points, seeds=range(1), duration=60, sample_interval=None,
+                 cache_directory='.sweep_cache', number_of_processes=None, height=DEFAULT_HEIGHT):
+        self.scene_class = scene_class
+        self.points = points
+        self.seeds = seeds
+        self.duration = duration
+        self.sample_interval = sample_interval or scene_class.update_frequency
+        self.cache_directory = cache_directory
+        self.number_of_processes = number_of_processes or cpu_count()
+        self.height = height
+
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def get_config(self, point):
+        config = self.scene_class.get_simulation_config()
+
+        for name, value in point.items():
+            if name not in config:
+                raise Exception(
+                    "{} is not a simulation attribute of {}".format(name, self.scene_class.__name__))
+
+            # Values take the type of the scene default. Defaults like
+            # travel_rate = 0 are ints but take any value, only the counts are
+            # rounded. Strings and None defaults are used as given
+            default = config[name]
+
+            if isinstance(default, bool):
+                if isinstance(value, str):
+                    value = value.lower() in ('true', '1')
+                else:
+                    value = bool(value)
+            elif name in INTEGER_ATTRIBUTES:
+                value = int(round(value))
+            elif isinstance(default, (int, float)):
+                value = float(value)
+
+            config[name] = value
+
+        return config
+
+    def get_key(self, config, seed, policies):
+        # Everything the samples depend on
+        travel_network = config['travel_network']
+
+        description = json.dumps({
+            'version': CACHE_VERSION,
+            'config': config,
+            # Editing the network file changes the runs, not its path
+            'travel_network_hash': None if travel_network in ('uniform', 'gravity')
+            else get_file_hash(travel_network),
+            'policies_hash': hashlib.sha256(pickle.dumps(policies)).hexdigest(),
+            'seed': seed,
+            'duration': self.duration,
+            'sample_interval': self.sample_interval,
+            'height': self.height,
+        }, sort_keys=True, default=str)
+
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def get_cache_path(self, key):
+        return os.path.join(self.cache_directory, key + '.npy')
+
+    def run(self):
+        # Yields (point, seed, samples), the cached runs first
+        runs = {}
+        run_args = {}
+
+        for point in self.points:
+            config = self.get_config(point)
+
+            for seed in self.seeds:
+                # The interventions of the scene, made for every run
+                policies = self.scene_class.get_policies()
+                key = self.get_key(config, seed, policies)
+
+                # Points that end up with the same config share their runs
+                runs.setdefault(key, []).append((point, seed))
+                run_args[key] = (config, seed, self.height,
+                                 self.duration, self.sample_interval, policies)
+
+        missing_args = []
+
+        for key in runs:
+            if not os.path.exists(self.get_cache_path(key)):
+                missing_args.append((key, run_args[key]))
+                continue
+
+            samples = np.load(self.get_cache_path(key))
+
+            for run in runs[key]:
+                yield (*run, samples)
+
+        if len(missing_args) == 0:
+            return
+
+        with Pool(self.number_of_processes) as pool:
+            for key, samples in pool.imap_unordered(_run_simulation, missing_args):
+                # Written aside first, so an interrupted sweep leaves no partial file
+                temporary_path = self.get_cache_path(key + '.partial')
+                np.save(temporary_path, samples)
+                os.replace(temporary_path, self.get_cache_path(key))
+
+                for run in runs[key]:
+                    yield (*run, samples)
+
+    def get_results(self):
+        # One row per point and seed, the point values then the outcomes
+        results = []
+
+        for point, seed, samples in self.run():
+            # The values as they were used, a drawn population is rounded
+            config = self.get_config(point)
+
+            results.append({
+                **{name: config[name] for name in point},
+                'seed': seed,
+                **get_outcomes(samples, self.sample_interval)
+            })
+
+        return results
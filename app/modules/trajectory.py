@@ -0,0 +1,250 @@
+import os
+import json
+import numpy as np
+from app.modules.population_state import PopulationState
+from app.modules.transmission_log import TransmissionLog
+
+
+TRAJECTORY_VERSION = 2
+
+# What is recorded on every tick, name: dtype,
+# just enough to draw the people again
+TRAJECTORY_FIELDS = {
+    'positions': np.float32,
+    'statuses': np.int8,
+    'symptomatic': np.bool_,
+    'city_indices': np.int32,
+}
+
+# A frame time this close after a tick still shows it
+TIME_TOLERANCE = 1e-9
+
+
+def get_chunk_path(directory, chunk_index, name):
+    return os.path.join(directory, 'chunk_{:05d}_{}.npy'.format(chunk_index, name))
+
+
+class TrajectoryRecorder:
+    def __init__(self, directory, engine, chunk_size=256):
+        # Ticks are buffered and written chunk_size at a time,
+        # each chunk is a set of .npy files that are never written again
+        self.directory = directory
+        self.population_state = engine.population_state
+        self.transmission_log = engine.transmission_log
+        self.chunk_size = chunk_size
+        # Rows of the transmission log already in a chunk
+        self.number_of_written_transmissions = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        population = self.population_state
+
+        self.manifest = {
+            'version': TRAJECTORY_VERSION,
+            'number_of_agents': len(population),
+            'city_centers': engine.city_centers.tolist(),
+            'city_bounds': [bounds.tolist() for bounds in engine.city_bounds],
+            'chunks': [],
+        }
+
+        np.save(os.path.join(directory, 'infection_radii.npy'),
+                population.infection_radii)
+
+        self.times = []
+        self.buffers = {
+            name: np.zeros((chunk_size, *getattr(population, name).shape), dtype=dtype)
+            for name, dtype in TRAJECTORY_FIELDS.items()
+        }
+
+        self._write_manifest()
+
+    def record(self, time):
+        tick_index = len(self.times)
+
+        for name in TRAJECTORY_FIELDS:
+            self.buffers[name][tick_index] = getattr(
+                self.population_state, name)
+
+        self.times.append(time)
+
+        if len(self.times) == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.times) == 0:
+            return
+
+        chunk_index = len(self.manifest['chunks'])
+        number_of_ticks = len(self.times)
+
+        np.save(get_chunk_path(self.directory, chunk_index, 'times'),
+                np.array(self.times))
+
+        for name in TRAJECTORY_FIELDS:
+            np.save(get_chunk_path(self.directory, chunk_index, name),
+                    self.buffers[name][:number_of_ticks])
+
+        # The infections logged since the last chunk
+        first_row = min(self.number_of_written_transmissions,
+                        len(self.transmission_log))
+
+        for name in TransmissionLog.FIELDS:
+            np.save(get_chunk_path(self.directory, chunk_index, 'transmission_' + name),
+                    self.transmission_log.get(name)[first_row:])
+
+        self.number_of_written_transmissions = len(self.transmission_log)
+
+        self.manifest['chunks'].append({
+            'start_time': self.times[0],
+            'end_time': self.times[-1],
+            'number_of_ticks': number_of_ticks,
+        })
+        self.times = []
+
+        self._write_manifest()
+
+    def _write_manifest(self):
+        # Replaced in one go, a reader never sees half a manifest
+        path = os.path.join(self.directory, 'manifest.json')
+
+        with open(path + '.partial', 'w') as file:
+            json.dump(self.manifest, file)
+
+        os.replace(path + '.partial', path)
+
+    def close(self):
+        self.flush()
+
+
+class TrajectoryPlayer:
+    def __init__(self, directory, height=None):
+        # Stands in for the engine, showing the recorded ticks instead of stepping.
+        # Only the chunk being shown is open, and it is memory mapped
+        self.directory = directory
+
+        with open(os.path.join(directory, 'manifest.json')) as file:
+            self.manifest = json.load(file)
+
+        if self.manifest['version'] != TRAJECTORY_VERSION:
+            raise Exception("Trajectory version {} is not supported, expected {}".format(
+                self.manifest['version'], TRAJECTORY_VERSION))
+
+        if len(self.manifest['chunks']) == 0:
+            raise Exception(
+                "The trajectory in {} has no recorded ticks".format(directory))
+
+        city_centers = np.array(self.manifest['city_centers'])
+        lower_bounds, upper_bounds = (
+            np.array(bounds) for bounds in self.manifest['city_bounds'])
+
+        # The recording is drawn at any height, scaled around the origin like the engine layout
+        self.scale_factor = 1
+
+        if height is not None:
+            self.scale_factor = height / \
+                (upper_bounds[:, 1].max() - lower_bounds[:, 1].min())
+
+        self.city_centers = city_centers * self.scale_factor
+        self.city_bounds = (lower_bounds * self.scale_factor,
+                            upper_bounds * self.scale_factor)
+
+        self.population_state = PopulationState(
+            self.manifest['number_of_agents'], number_of_cities=len(city_centers))
+        self.population_state.infection_radii[:] = np.load(
+            os.path.join(directory, 'infection_radii.npy')) * self.scale_factor
+
+        self.chunk_start_times = np.array(
+            [chunk['start_time'] for chunk in self.manifest['chunks']])
+        self.chunk_index = None
+        self.chunk = None
+
+        # Small next to the positions, the whole log is read at once
+        self.recorded_transmission_log = TransmissionLog(
+            self.manifest['number_of_agents'])
+        self.recorded_transmission_log.append(*(
+            np.concatenate([
+                np.load(get_chunk_path(directory, chunk_index, 'transmission_' + name))
+                for chunk_index in range(len(self.manifest['chunks']))
+            ])
+            for name in TransmissionLog.FIELDS
+        ))
+        self.recorded_transmission_log.get('distances')[:] *= self.scale_factor
+
+        # Changed by the policies, the travels are already part of the recording
+        self.travel_rate = 0
+        self.social_distance_factor = 0
+        self.policy_scheduler = None
+
+        self.time = 0
+        self._show_time(self.time)
+
+    def _load_chunk(self, chunk_index):
+        self.chunk_index = chunk_index
+        self.chunk = {
+            name: np.load(get_chunk_path(self.directory, chunk_index, name), mmap_mode='r')
+            for name in ['times', *TRAJECTORY_FIELDS]
+        }
+
+    def _show_time(self, time):
+        # The last tick at or before the time, or the first one
+        chunk_index = max(np.searchsorted(
+            self.chunk_start_times, time + TIME_TOLERANCE, side='right') - 1, 0)
+
+        if chunk_index != self.chunk_index:
+            self._load_chunk(chunk_index)
+
+        tick_index = max(np.searchsorted(
+            self.chunk['times'], time + TIME_TOLERANCE, side='right') - 1, 0)
+
+        population = self.population_state
+
+        population.positions[:] = self.chunk['positions'][tick_index] * \
+            self.scale_factor
+
+        for name in ['statuses', 'symptomatic', 'city_indices']:
+            getattr(population, name)[:] = self.chunk[name][tick_index]
+
+        population.reset_status_counts()
+
+    @property
+    def transmission_log(self):
+        # The infections up to the shown time, the rows are in time order
+        recorded = self.recorded_transmission_log
+        number_of_rows = np.searchsorted(
+            recorded.get('times'), self.time + TIME_TOLERANCE, side='right')
+
+        transmission_log = TransmissionLog(len(self.population_state))
+        transmission_log.set_arrays({
+            name: values[:number_of_rows] for name, values in recorded.get_arrays().items()})
+
+        return transmission_log
+
+    def advance(self, delta_time, update_statuses=True):
+        # There are no ticks to replay the interventions on, only the shown time
+        if self.policy_scheduler is not None:
+            self.policy_scheduler.update(self.time)
+
+        self.time += delta_time
+
+        self._show_time(self.time)
+
+    def get_render_positions(self):
+        return self.population_state.positions
+
+    def get_stats(self):
+        return self.population_state.status_totals.copy()
+
+    def get_city_stats(self):
+        return self.population_state.status_counts.copy()
+
+    def get_averaged_stats(self):
+        stats = self.get_stats()
+
+        return stats / sum(stats)
+
+    def change_social_distance_factor(self, new_value, social_distancing_probability, indices=None):
+        # Already part of the recording
+        return np.zeros(0, dtype=np.int64)
+
+    def close(self):
+        self.chunk = None
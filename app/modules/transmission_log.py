@@ -0,0 +1,110 @@
+import numpy as np
+
+
+class TransmissionLog:
+    # name: dtype, one row per infection
+    FIELDS = {
+        # -1 for the people infected at the start
+        'infectors': np.int64,
+        'infectees': np.int64,
+        'times': np.float64,
+        'city_indices': np.int32,
+        'distances': np.float64,
+    }
+
+    def __init__(self, number_of_people, capacity=1024):
+        self.number_of_people = number_of_people
+        self.size = 0
+
+        for name, dtype in self.FIELDS.items():
+            setattr(self, '_' + name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.size
+
+    def get(self, name):
+        return getattr(self, '_' + name)[:self.size]
+
+    def append(self, infectors, infectees, times, city_indices, distances):
+        number_of_rows = len(infectees)
+        new_size = self.size + number_of_rows
+
+        # Grown by doubling, appending stays amortized O(1) per row
+        capacity = len(self._infectees)
+
+        if new_size > capacity:
+            capacity = max(new_size, 2 * capacity)
+
+            for name in self.FIELDS:
+                array = getattr(self, '_' + name)
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[:self.size] = array[:self.size]
+
+                setattr(self, '_' + name, grown)
+
+        rows = {
+            'infectors': infectors,
+            'infectees': infectees,
+            'times': times,
+            'city_indices': city_indices,
+            'distances': distances,
+        }
+
+        for name, values in rows.items():
+            getattr(self, '_' + name)[self.size:new_size] = values
+
+        self.size = new_size
+
+    def get_infection_times(self):
+        # Per person, NaN for the people never infected
+        infection_times = np.full(self.number_of_people, np.nan)
+        infection_times[self.get('infectees')] = self.get('times')
+
+        return infection_times
+
+    def get_secondary_cases(self):
+        # Per row, how many people the infectee went on to infect
+        infectors = self.get('infectors')
+        secondary_cases = np.bincount(
+            infectors[infectors >= 0], minlength=self.number_of_people)
+
+        return secondary_cases[self.get('infectees')]
+
+    def get_secondary_case_distribution(self):
+        # How many cases infected 0, 1, 2... people
+        return np.bincount(self.get_secondary_cases())
+
+    def get_generation_intervals(self):
+        # Time between the infection of the infector and the one it caused
+        infectors = self.get('infectors')
+        caused = infectors >= 0
+
+        return self.get('times')[caused] - self.get_infection_times()[infectors[caused]]
+
+    def get_reproduction_numbers(self, bin_width=1):
+        # Realized R(t), the mean number of people infected by the cases of each time bin.
+        # The last bins are low, their cases are still infecting
+        if self.size == 0:
+            return np.zeros(0), np.zeros(0)
+
+        bins = np.floor(self.get('times') / bin_width).astype(int)
+
+        cases = np.bincount(bins)
+        secondary_cases = np.bincount(
+            bins, weights=self.get_secondary_cases())
+
+        with np.errstate(invalid='ignore'):
+            reproduction_numbers = secondary_cases / cases
+
+        return np.arange(len(cases)) * bin_width, reproduction_numbers
+
+    def get_arrays(self):
+        return {name: self.get(name) for name in self.FIELDS}
+
+    def set_arrays(self, arrays):
+        self.size = 0
+        self.append(*(arrays[name] for name in self.FIELDS))
+
+    def save(self, path, **arrays):
+        # Extra arrays, like the S/I/R series, are saved in the same file
+        np.savez_compressed(path, **self.get_arrays(), **arrays)
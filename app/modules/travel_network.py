@@ -0,0 +1,96 @@
+import numpy as np
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+
+def normalize_travel_matrix(travel_matrix):
+    # Rows become the probabilities of going from a city to each of the others
+    travel_matrix = sparse.csr_matrix(travel_matrix, dtype=np.float64)
+    travel_matrix = sparse.csr_matrix(
+        travel_matrix - sparse.diags(travel_matrix.diagonal()))
+    travel_matrix.eliminate_zeros()
+
+    row_sums = np.asarray(travel_matrix.sum(axis=1)).ravel()
+    scales = np.divide(1, row_sums, out=np.zeros_like(
+        row_sums), where=row_sums > 0)
+
+    return sparse.csr_matrix(sparse.diags(scales) @ travel_matrix)
+
+
+def get_uniform_travel_matrix(number_of_cities):
+    # Everyone is as likely to go to any other city
+    origins = np.repeat(np.arange(number_of_cities), number_of_cities)
+    destinations = np.tile(np.arange(number_of_cities), number_of_cities)
+    others = origins != destinations
+
+    return normalize_travel_matrix(sparse.csr_matrix(
+        (np.ones(others.sum()), (origins[others], destinations[others])),
+        shape=(number_of_cities, number_of_cities)
+    ))
+
+
+def get_gravity_travel_matrix(city_centers, city_populations, distance_exponent=2, number_of_destinations=10):
+    # The flow between two cities grows with their populations and falls with their distance,
+    # only the closest destinations of each city are kept so the matrix stays sparse
+    number_of_cities = len(city_centers)
+    k = min(number_of_destinations + 1, number_of_cities)
+
+    distances, neighbours = cKDTree(city_centers[:, :2]).query(
+        city_centers[:, :2], k=k)
+    distances = np.reshape(distances, (number_of_cities, k))
+    neighbours = np.reshape(neighbours, (number_of_cities, k))
+
+    origins = np.repeat(np.arange(number_of_cities), k)
+    destinations = neighbours.ravel()
+    distances = distances.ravel()
+
+    others = origins != destinations
+    origins, destinations, distances = origins[others], destinations[others], distances[others]
+
+    flows = city_populations[origins] * city_populations[destinations] / \
+        distances ** distance_exponent
+
+    return normalize_travel_matrix(sparse.csr_matrix(
+        (flows, (origins, destinations)), shape=(number_of_cities, number_of_cities)))
+
+
+def load_travel_matrix(path, number_of_cities):
+    # A scipy.sparse .npz of origin-destination rates
+    travel_matrix = sparse.load_npz(path)
+
+    if travel_matrix.shape != (number_of_cities, number_of_cities):
+        raise Exception("Travel matrix of shape {} does not match {} cities".format(
+            travel_matrix.shape, number_of_cities))
+
+    return normalize_travel_matrix(travel_matrix)
+
+
+class TravelNetwork:
+    def __init__(self, travel_matrix):
+        self.travel_matrix = normalize_travel_matrix(travel_matrix)
+
+        indptr = self.travel_matrix.indptr
+        number_of_destinations = np.diff(indptr)
+
+        # Cities without destinations nobody leaves
+        self.has_destinations = number_of_destinations > 0
+
+        # Cumulated probabilities, offset by the row, so row r spans (r, r + 1]
+        # and every traveller is sampled with one searchsorted
+        rows = np.repeat(np.arange(len(number_of_destinations)),
+                         number_of_destinations)
+        cumulated = np.cumsum(self.travel_matrix.data)
+        row_starts = np.concatenate([[0], cumulated])[indptr[:-1]]
+
+        self.keys = rows + cumulated - row_starts[rows]
+
+    def sample_destinations(self, origins, random_state=np.random):
+        indptr = self.travel_matrix.indptr
+
+        targets = origins + random_state.random_sample(len(origins))
+        positions = np.searchsorted(self.keys, targets, side='right')
+
+        # Rounding can leave a target past the last key of its row
+        positions = np.clip(positions, indptr[origins], indptr[origins + 1] - 1)
+
+        return self.travel_matrix.indices[positions]
@@ -42,3 +42,21 @@ class ValueSlider(NumberLine):
             self,
             lambda obj, p: obj._update(start_value, new_value, p)
         )
+
+    def start_change(self, new_value, run_time=1):
+        # Like the change animation, but run by an updater so the scene does not wait for it
+        self.is_animating = True
+
+        start_value = self.p2n(self.marker.get_bottom())
+        self.change_time = 0
+
+        def update(obj, delta_time):
+            obj.change_time += delta_time
+            progress = min(obj.change_time / run_time, 1)
+
+            obj._update(start_value, new_value, smooth(progress))
+
+            if progress >= 1:
+                obj.remove_updater(update)
+
+        self.add_updater(update)
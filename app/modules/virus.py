@@ -1,4 +1,23 @@
+import numpy as np
+
+
 class Virus:
-    def __init__(self, probability_of_infection_per_day=0.5, infection_duration=5):
+    def __init__(self, probability_of_infection_per_day=0.5, infection_duration=5, infection_duration_deviation=0):
         self.probability_of_infection_per_day = probability_of_infection_per_day
         self.infection_duration = infection_duration  # unit days
+        self.infection_duration_deviation = infection_duration_deviation  # unit days
+
+    def get_step_probability(self, delta_time):
+        # Chance of infection over delta_time days, so a whole day of contact
+        # gives probability_of_infection_per_day however it is split in steps
+        return 1 - (1 - self.probability_of_infection_per_day) ** delta_time
+
+    def get_infection_durations(self, size, random_state=np.random):
+        if self.infection_duration_deviation == 0:
+            return np.full(size, self.infection_duration, dtype=np.float64)
+
+        # Gamma distributed, so the durations stay positive
+        shape = (self.infection_duration / self.infection_duration_deviation) ** 2
+        scale = self.infection_duration_deviation ** 2 / self.infection_duration
+
+        return random_state.gamma(shape, scale, size)
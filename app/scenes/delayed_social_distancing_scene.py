@@ -1,5 +1,6 @@
 from manimlib.imports import *
 from app.modules.value_slider import ValueSlider
+from app.modules.policies import TimeTrigger, SocialDistancing
 from app.scenes.simple_simulation_scene import SimpleSimulationScene
 
 
@@ -9,20 +10,21 @@ class DelayedSocialDistancingScene(SimpleSimulationScene):
     social_distancing_probability = 1
 
     def construct(self):
-        self.wait(self.delay_duration)
+        self._run_till_no_infections()
 
-        self.simulation.change_social_distance_factor(
-            self.target_social_distancing_factor,
-            self.social_distancing_probability
-        )
+    @classmethod
+    def get_policies(cls):
+        return [(TimeTrigger(cls.delay_duration), cls._get_social_distancing_policy())]
 
-        self.play(
-            self.sliders[0].get_change_animation(
-                self.target_social_distancing_factor
-            )
+    @classmethod
+    def _get_social_distancing_policy(cls):
+        return SocialDistancing(
+            cls.target_social_distancing_factor,
+            compliance=cls.social_distancing_probability
         )
 
-        self._run_till_no_infections()
+    def _on_policy_start(self, policy):
+        self.sliders[0].start_change(policy.social_distance_factor)
 
     def _add_sliders(self):
         self.sliders = VGroup()
@@ -7,3 +7,5 @@ class LargeCityScene(SimpleSimulationScene):
     radius = .2 / 3
     infection_radius = .25
     max_speed = .25
+
+    neighbour_list_skin = .1
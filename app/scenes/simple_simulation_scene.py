@@ -1,5 +1,6 @@
 from manimlib.imports import *
 from app.modules.simulation import Simulation
+from app.modules.replay_simulation import ReplaySimulation
 from app.modules.graph import Graph
 
 
@@ -28,10 +29,45 @@ class SimpleSimulationScene(Scene):
 
     # Virus config
     infection_duration = 5
+    # Spread of the infection duration between people, 0 for all the same
+    infection_duration_deviation = 0
     probability_of_infection_per_day = .2
+    # 'per_contact' draws for every infected neighbour,
+    # 'per_neighbour_count' once per exposed person
+    infection_model = 'per_contact'
 
     # Travel
     travel_rate = 0
+    # 'uniform', 'gravity' or the path of a scipy.sparse .npz origin-destination matrix
+    travel_network = 'uniform'
+    gravity_distance_exponent = 2
+    gravity_number_of_destinations = 10
+
+    use_spatial_hash = True
+
+    # Reuse the pairs of people between the steps until someone moved more than
+    # half the skin, 0 finds them again on every step. The cutoff defaults to the
+    # infection radius
+    neighbour_list_skin = 0
+    neighbour_list_cutoff = None
+
+    # Physics step, frames with a longer dt are split in several steps
+    time_step = 1 / 60
+    interpolate_positions = False
+
+    # Check the S/I/R counts against a full scan on every read
+    debug_stats = False
+
+    # Step groups of cities in this many processes, 0 steps everything in this one
+    number_of_workers = 0
+
+    # Directory to record every step to, and to draw a recording from instead of simulating
+    trajectory_path = None
+    replay_path = None
+
+    # Draw the cities filled with their S/I/R mix instead of the people,
+    # None does it when the people would be smaller than a pixel
+    aggregate_cities = None
 
     colors_set = {
         'S': BLUE,
@@ -49,6 +85,7 @@ class SimpleSimulationScene(Scene):
 
         self._add_sliders()
         self._add_simulation()
+        self._add_policies()
         self._position_camera()
         self._add_graph()
         self._position_sliders()
@@ -56,6 +93,51 @@ class SimpleSimulationScene(Scene):
     def construct(self):
         self._run_till_no_infections()
 
+    def tear_down(self):
+        self.simulation.close()
+
+        super().tear_down()
+
+    @classmethod
+    def get_simulation_config(cls):
+        # The class attributes are the whole config,
+        # so it can be read without creating the scene
+        return {
+            'number_of_cities': cls.number_of_cities,
+            'city_size': cls.city_size,
+            'population': cls.population,
+            'limit_social_distancing_to_infectious': cls.limit_social_distancing_to_infectious,
+            'radius': cls.radius,
+            'infection_radius': cls.infection_radius,
+            'wall_buffer': cls.wall_buffer,
+            'wander_step_size': cls.wander_step_size,
+            'wander_step_duration': cls.wander_step_duration,
+            'gravity_strength': cls.gravity_strength,
+            'social_distance_factor': cls.social_distance_factor,
+            'repel_from_max_number_of_people': cls.repel_from_max_number_of_people,
+            'max_speed': cls.max_speed,
+            'p_symptomatic_on_infection': cls.p_symptomatic_on_infection,
+            'infection_duration': cls.infection_duration,
+            'infection_duration_deviation': cls.infection_duration_deviation,
+            'probability_of_infection_per_day': cls.probability_of_infection_per_day,
+            'infection_model': cls.infection_model,
+            'travel_rate': cls.travel_rate,
+            'travel_network': cls.travel_network,
+            'gravity_distance_exponent': cls.gravity_distance_exponent,
+            'gravity_number_of_destinations': cls.gravity_number_of_destinations,
+            'use_spatial_hash': cls.use_spatial_hash,
+            'neighbour_list_skin': cls.neighbour_list_skin,
+            'neighbour_list_cutoff': cls.neighbour_list_cutoff,
+            'time_step': cls.time_step,
+            'interpolate_positions': cls.interpolate_positions,
+            'debug_stats': cls.debug_stats,
+            'number_of_workers': cls.number_of_workers,
+            'trajectory_path': cls.trajectory_path,
+            'aggregate_cities': cls.aggregate_cities,
+            'update_frequency': cls.update_frequency,
+            'colors_set': cls.colors_set
+        }
+
     def _add_simulation(self):
         height = self.camera.frame.get_height() * .9
         position = np.array([self.camera.frame.get_corner(
@@ -65,31 +147,25 @@ class SimpleSimulationScene(Scene):
             height = self.camera.frame.get_height() - self.sliders.get_height()
             position = self.camera.frame.get_corner(UR)
 
-        self.simulation = Simulation(
-            sliders=self.sliders,
-            position=position,
-            height=height,
-            config={
-                'number_of_cities': self.number_of_cities,
-                'city_size': self.city_size,
-                'population': self.population,
-                'limit_social_distancing_to_infectious': self.limit_social_distancing_to_infectious,
-                'radius': self.radius,
-                'infection_radius': self.infection_radius,
-                'wall_buffer': self.wall_buffer,
-                'wander_step_size': self.wander_step_size,
-                'wander_step_duration': self.wander_step_duration,
-                'gravity_strength': self.gravity_strength,
-                'social_distance_factor': self.social_distance_factor,
-                'repel_from_max_number_of_people': self.repel_from_max_number_of_people,
-                'max_speed': self.max_speed,
-                'p_symptomatic_on_infection': self.p_symptomatic_on_infection,
-                'infection_duration': self.infection_duration,
-                'probability_of_infection_per_day': self.probability_of_infection_per_day,
-                'travel_rate': self.travel_rate,
-                'colors_set': self.colors_set
-            }
-        )
+        pixel_size = self.camera.frame.get_height() / self.camera.get_pixel_height()
+
+        if self.replay_path is not None:
+            self.simulation = ReplaySimulation(
+                trajectory_path=self.replay_path,
+                sliders=self.sliders,
+                position=position,
+                height=height,
+                config=self.get_simulation_config(),
+                pixel_size=pixel_size
+            )
+        else:
+            self.simulation = Simulation(
+                sliders=self.sliders,
+                position=position,
+                height=height,
+                config=self.get_simulation_config(),
+                pixel_size=pixel_size
+            )
 
         self.add(self.simulation)
 
@@ -101,6 +177,7 @@ class SimpleSimulationScene(Scene):
         frame_height, frame_width = frame.get_height(), frame.get_width()
 
         simulation_width = self.simulation.get_width()
+        pixel_size = frame_height / self.camera.get_pixel_height()
 
         for data_index, graph_name, color_name in zip(range(3), ['Susceptible', 'Infected', 'Recovered'], 'SIR'):
             graphs.add(Graph(
@@ -111,7 +188,7 @@ class SimpleSimulationScene(Scene):
                 (self.number_of_graphs * .3),
                 color=self.simulation.colors_set[color_name],
                 data_index=data_index,
-                update_frequency=self.update_frequency
+                pixel_size=pixel_size
                 # **self.graph_config,
             ))
 
@@ -129,6 +206,21 @@ class SimpleSimulationScene(Scene):
     def _add_sliders(self):
         pass
 
+    @classmethod
+    def get_policies(cls):
+        # (trigger, policy) pairs, made again for every simulation since the
+        # policies keep their state. The headless runs use them too
+        return []
+
+    def _add_policies(self):
+        for trigger, policy in self.get_policies():
+            policy.on_start = self._on_policy_start
+
+            self.simulation.policy_scheduler.add(trigger, policy)
+
+    def _on_policy_start(self, policy):
+        pass
+
     def _position_sliders(self):
         if self.sliders:
             width, height = self.simulation.get_width() - 2, self.sliders.get_height()
@@ -64,6 +64,7 @@ class Camera(object):
         self.init_frame()
         self.init_context(ctx)
         self.init_shaders()
+        self.init_render_buffers()
         self.init_textures()
 
     def init_frame(self):
@@ -227,16 +228,57 @@ class Camera(object):
 
             shader = self.get_shader(info_group[0])
             render_primative = int(info_group[0]["render_primative"])
-            self.render(shader, data, render_primative)
+            self.render(shader, data, render_primative, sid)
 
-    def render(self, shader, data, render_primative):
+    def render(self, shader, data, render_primative, sid=None):
         if data is None or len(data) == 0:
             return
         if shader is None:
             return
-        vbo = self.ctx.buffer(data.tobytes())
+        vbo, vao = self.get_render_buffers(shader, data, sid)
+        vao.render(render_primative, vertices=len(data))
+
+    # Buffers
+    def init_render_buffers(self):
+        # sid -> (vbo, vao), reused from one frame to the next
+        self.id_to_render_buffers = {}
+
+    def get_render_buffers(self, shader, data, sid=None):
+        if sid is None:
+            sid = next(
+                key for key, value in self.id_to_shader.items()
+                if value is shader
+            )
+        data = np.ascontiguousarray(data)
+
+        if sid in self.id_to_render_buffers:
+            vbo, vao = self.id_to_render_buffers[sid]
+            if data.nbytes <= vbo.size:
+                # Fresh storage, so the draws still reading the
+                # previous contents don't have to be waited for
+                vbo.orphan()
+                vbo.write(data)
+                return vbo, vao
+            # Grown by doubling, the smaller buffers are released
+            capacity = max(data.nbytes, 2 * vbo.size)
+            self.release_render_buffers(sid)
+        else:
+            capacity = data.nbytes
+
+        vbo = self.ctx.buffer(reserve=capacity, dynamic=True)
+        vbo.write(data)
         vao = self.ctx.simple_vertex_array(shader, vbo, *data.dtype.names)
-        vao.render(render_primative)
+        self.id_to_render_buffers[sid] = (vbo, vao)
+        return vbo, vao
+
+    def release_render_buffers(self, sid=None):
+        # Those of one shader, or all of them when sid is None
+        sids = list(self.id_to_render_buffers) if sid is None else [sid]
+        for sid in sids:
+            if sid in self.id_to_render_buffers:
+                vbo, vao = self.id_to_render_buffers.pop(sid)
+                vao.release()
+                vbo.release()
 
     # Shaders
     def init_shaders(self):
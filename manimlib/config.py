@@ -98,6 +98,17 @@ def parse_cli():
                  "in two comma separated values, e.g. \"3,6\", it will end"
                  "the rendering at the second value",
         )
+        parser.add_argument(
+            "--fast_forward_to",
+            type=float,
+            help="Run the updaters without rendering until the scene reaches "
+                 "this time, then render the rest of it",
+        )
+        parser.add_argument(
+            "--fast_forward_until",
+            help="Name of a method of the scene, the updaters run without "
+                 "rendering until it returns True",
+        )
         parser.add_argument(
             "-r", "--resolution",
             help="Resolution, passed as \"height,width\"",
@@ -221,6 +232,8 @@ def get_configuration(args):
         "write_all": args.write_all,
         "start_at_animation_number": args.start_at_animation_number,
         "end_at_animation_number": None,
+        "fast_forward_to": args.fast_forward_to,
+        "fast_forward_until": args.fast_forward_until,
         "leave_progress_bars": args.leave_progress_bars,
         "media_dir": args.media_dir,
         "video_dir": args.video_dir,
@@ -56,6 +56,8 @@ def get_scenes_to_render(scene_classes, config):
             "skip_animations",
             "start_at_animation_number",
             "end_at_animation_number",
+            "fast_forward_to",
+            "fast_forward_until",
             "leave_progress_bars",
             "preview",
         ]
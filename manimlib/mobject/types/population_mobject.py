@@ -0,0 +1,95 @@
+import moderngl
+
+from manimlib.constants import *
+from manimlib.mobject.mobject import Mobject
+from manimlib.utils.color import color_to_rgba
+
+# From the units of the stroke widths of VMobjects to frame units,
+# the factor the stroke shader applies
+STROKE_WIDTH_CONVERSION = 0.01
+
+
+class PopulationMobject(Mobject):
+    """
+    Many dots, each with an optional ring around it, drawn in a single
+    draw call. There is one row of shader data per dot, the disc and
+    the ring are drawn by the fragment shader.
+    """
+    CONFIG = {
+        "radius": 0.05,
+        "ring_radius": 0.2,
+        # In the units of the stroke widths of VMobjects
+        "ring_width": 2,
+        "vert_shader_file": "population_vert.glsl",
+        "geom_shader_file": "population_geom.glsl",
+        "frag_shader_file": "population_frag.glsl",
+        "render_primative": moderngl.POINTS,
+        "shader_dtype": [
+            ('point', np.float32, (3,)),
+            ('radius', np.float32, (1,)),
+            ('ring_radius', np.float32, (1,)),
+            ('ring_width', np.float32, (1,)),
+            ('color', np.float32, (4,)),
+            ('ring_opacity', np.float32, (1,)),
+        ]
+    }
+
+    def __init__(self, points, **kwargs):
+        self.initial_points = points
+        Mobject.__init__(self, **kwargs)
+
+    def reset_points(self):
+        self.points = np.zeros((0, 3))
+        self.radii = np.zeros(0)
+        self.ring_radii = np.zeros(0)
+        self.rgbas = np.zeros((0, 4))
+        self.ring_opacities = np.zeros(0)
+        return self
+
+    def init_points(self):
+        size = len(self.initial_points)
+
+        self.points = np.array(self.initial_points, dtype=np.float64)
+        self.radii = np.full(size, self.radius, dtype=np.float64)
+        self.ring_radii = np.full(size, self.ring_radius, dtype=np.float64)
+
+    def init_colors(self):
+        self.rgbas = np.repeat([color_to_rgba(self.color)], len(self.points), axis=0)
+        self.ring_opacities = np.zeros(len(self.points))
+
+    def get_array_attrs(self):
+        return Mobject.get_array_attrs(self) + [
+            "radii", "ring_radii", "rgbas", "ring_opacities"
+        ]
+
+    def set_radii(self, radii, indices=slice(None)):
+        self.radii[indices] = radii
+        return self
+
+    def set_ring_radii(self, ring_radii, indices=slice(None)):
+        self.ring_radii[indices] = ring_radii
+        return self
+
+    def set_rgbas(self, rgbas, indices=slice(None)):
+        self.rgbas[indices] = rgbas
+        return self
+
+    def set_color(self, color, family=True):
+        self.rgbas[:] = color_to_rgba(color)
+        self.color = color
+        return self
+
+    def set_ring_opacities(self, ring_opacities, indices=slice(None)):
+        self.ring_opacities[indices] = ring_opacities
+        return self
+
+    def get_shader_data(self):
+        data = self.get_blank_shader_data_array(len(self.points))
+        data["point"] = self.points
+        data["radius"] = self.radii.reshape((-1, 1))
+        data["ring_radius"] = self.ring_radii.reshape((-1, 1))
+        # In frame units, like the radii
+        data["ring_width"] = STROKE_WIDTH_CONVERSION * self.ring_width
+        data["color"] = self.rgbas
+        data["ring_opacity"] = self.ring_opacities.reshape((-1, 1))
+        return data
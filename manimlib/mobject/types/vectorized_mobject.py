@@ -852,7 +852,13 @@ class VMobject(Mobject):
         back_stroke_data = []
         stroke_data = []
         fill_data = []
+        other_infos = []
         for submob in self.family_members_with_points():
+            if not isinstance(submob, VMobject):
+                # Drawn by its own shaders, on top
+                other_infos.append(submob.get_shader_info())
+                continue
+
             stroke_width = submob.get_stroke_width()
             stroke_opacity = submob.get_stroke_opacity()
             fill_opacity = submob.get_fill_opacity()
@@ -878,6 +884,7 @@ class VMobject(Mobject):
         if stroke_data:
             stroke_info["data"] = np.hstack(stroke_data)
             result.append(stroke_info)
+        result.extend(other_infos)
         return result
 
     def get_stroke_shader_data(self):
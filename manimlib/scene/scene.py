@@ -33,6 +33,11 @@ class Scene(Container):
         "random_seed": 0,
         "start_at_animation_number": None,
         "end_at_animation_number": None,
+        # Updaters keep stepping at the frame rate, but nothing is
+        # rendered, until the time is reached or the method named
+        # by fast_forward_until returns True
+        "fast_forward_to": None,
+        "fast_forward_until": None,
         "leave_progress_bars": False,
         "preview": True,
         "linger_after_completion": True,
@@ -55,6 +60,11 @@ class Scene(Container):
         self.time = 0
         self.skip_time = 0
         self.original_skipping_status = self.skip_animations
+        self.fast_forwarding = False
+        self.fast_forward_stop_reached = False
+        self.writing_animation = False
+        # Plays before it were skipped or fast forwarded and wrote no partial movie file
+        self.first_written_play_number = None
         self.time_of_last_frame = time.time()
 
         # Items associated with interaction
@@ -94,6 +104,7 @@ class Scene(Container):
         self.file_writer.finish()
         if self.window and self.linger_after_completion:
             self.interact()
+        self.camera.release_render_buffers()
 
     def interact(self):
         # If there is a window, enter a loop
@@ -131,7 +142,9 @@ class Scene(Container):
     def update_frame(self, dt=0, ignore_skipping=False):
         self.increment_time(dt)
         self.update_mobjects(dt)
-        if self.skip_animations and not ignore_skipping:
+        if self.fast_forwarding:
+            self.update_fast_forward_status()
+        if (self.skip_animations or self.fast_forwarding) and not ignore_skipping:
             return
 
         if self.window:
@@ -149,8 +162,12 @@ class Scene(Container):
                 self.update_frame(0)
 
     def emit_frame(self):
-        if not self.skip_animations:
-            self.file_writer.write_frame(self.camera)
+        if self.skip_animations or self.fast_forwarding:
+            return
+        # A play started while fast forwarding is written
+        # from the frame where fast forwarding stopped
+        self.begin_writing_animation()
+        self.file_writer.write_frame(self.camera)
 
     ###
 
@@ -337,6 +354,22 @@ class Scene(Container):
             if self.num_plays >= self.end_at_animation_number:
                 raise EndSceneEarlyException()
 
+    def update_fast_forward_status(self):
+        # Checked before every play and on every frame while fast forwarding
+        was_fast_forwarding = self.fast_forwarding
+        self.fast_forwarding = False
+        if self.fast_forward_to is not None and self.time < self.fast_forward_to:
+            self.fast_forwarding = True
+        if self.fast_forward_until is not None and not self.fast_forward_stop_reached:
+            if getattr(self, self.fast_forward_until)():
+                self.fast_forward_stop_reached = True
+            else:
+                self.fast_forwarding = True
+        if was_fast_forwarding and not self.fast_forwarding and self.window:
+            # Play in real time from here, not catching up on the skipped time
+            self.real_animation_start_time = time.time()
+            self.virtual_animation_start_time = self.time
+
     def stop_skipping(self):
         if self.skip_animations:
             self.skip_animations = False
@@ -346,9 +379,9 @@ class Scene(Container):
     def handle_play_like_call(func):
         def wrapper(self, *args, **kwargs):
             self.update_skipping_status()
-            should_write = not self.skip_animations
-            if should_write:
-                self.file_writer.begin_animation()
+            self.update_fast_forward_status()
+            if not self.skip_animations and not self.fast_forwarding:
+                self.begin_writing_animation()
 
             if self.window:
                 self.real_animation_start_time = time.time()
@@ -356,12 +389,20 @@ class Scene(Container):
 
             func(self, *args, **kwargs)
 
-            if should_write:
+            if self.writing_animation:
                 self.file_writer.end_animation()
+                self.writing_animation = False
 
             self.num_plays += 1
         return wrapper
 
+    def begin_writing_animation(self):
+        if not self.writing_animation:
+            if self.first_written_play_number is None:
+                self.first_written_play_number = self.num_plays
+            self.file_writer.begin_animation()
+            self.writing_animation = True
+
     def lock_static_mobject_data(self, *animations):
         movers = list(it.chain(*[
             anim.mobject.get_family()
@@ -456,7 +497,8 @@ class Scene(Container):
     @handle_play_like_call
     def wait(self, duration=DEFAULT_WAIT_TIME, stop_condition=None):
         self.update_mobjects(dt=0)  # Any problems with this?
-        if self.should_update_mobjects():
+        # Fast forwarding goes frame by frame to stop at the right one
+        if self.should_update_mobjects() or self.fast_forwarding:
             self.lock_static_mobject_data()
             time_progression = self.get_wait_time_progression(duration, stop_condition)
             last_t = 0
@@ -252,6 +252,13 @@ class SceneFileWriter(object):
         }
         if self.scene.start_at_animation_number is not None:
             kwargs["min_index"] = self.scene.start_at_animation_number
+        if self.scene.fast_forward_to is not None or self.scene.fast_forward_until is not None:
+            # Fast forwarded plays write nothing, so files with their indices
+            # are left over from an earlier render
+            first_written = self.scene.first_written_play_number
+            if first_written is None:
+                first_written = self.scene.num_plays
+            kwargs["min_index"] = max(kwargs.get("min_index", 0), first_written)
         if self.scene.end_at_animation_number is not None:
             kwargs["max_index"] = self.scene.end_at_animation_number
         else:
@@ -0,0 +1,26 @@
+#version 330
+
+in vec2 xy;
+in float radius;
+in float ring_radius;
+in float ring_width;
+in vec4 color;
+in float ring_opacity;
+in float uv_anti_alias_width;
+
+out vec4 frag_color;
+
+void main() {
+    float dist = length(xy);
+
+    // Signed distances to the disc and to the ring, negative inside
+    float disc_dist = dist - radius;
+    float ring_dist = abs(dist - ring_radius) - 0.5 * ring_width;
+
+    float disc_alpha = color.a * smoothstep(0.5, -0.5, disc_dist / uv_anti_alias_width);
+    float ring_alpha = color.a * ring_opacity * smoothstep(0.5, -0.5, ring_dist / uv_anti_alias_width);
+
+    frag_color = vec4(color.rgb, max(disc_alpha, ring_alpha));
+
+    if (frag_color.a == 0) discard;
+}
@@ -0,0 +1,56 @@
+#version 330
+
+layout (points) in;
+layout (triangle_strip, max_vertices = 4) out;
+
+uniform float scale;
+uniform float aspect_ratio;
+uniform float anti_alias_width;
+uniform vec3 frame_center;
+
+in vec3 v_point[1];
+in float v_radius[1];
+in float v_ring_radius[1];
+in float v_ring_width[1];
+in vec4 v_color[1];
+in float v_ring_opacity[1];
+
+out vec2 xy;
+out float radius;
+out float ring_radius;
+out float ring_width;
+out vec4 color;
+out float ring_opacity;
+out float uv_anti_alias_width;
+
+#INSERT scale_and_shift_point_for_frame.glsl
+
+void main(){
+    // Nothing to draw
+    if(v_color[0].a == 0 && v_ring_opacity[0] == 0) return;
+
+    // A square around the point, large enough for the disc and the ring
+    float half_size = anti_alias_width + max(
+        v_radius[0],
+        (v_ring_opacity[0] > 0) ? v_ring_radius[0] + 0.5 * v_ring_width[0] : 0
+    );
+
+    for(int i = 0; i < 4; i++){
+        vec2 corner = vec2(2 * (i / 2) - 1, 2 * (i % 2) - 1);
+
+        xy = half_size * corner;
+        radius = v_radius[0];
+        ring_radius = v_ring_radius[0];
+        ring_width = v_ring_width[0];
+        color = v_color[0];
+        ring_opacity = v_ring_opacity[0];
+        uv_anti_alias_width = anti_alias_width;
+
+        gl_Position = vec4(
+            scale_and_shift_point_for_frame(v_point[0] + vec3(xy, 0)),
+            1.0
+        );
+        EmitVertex();
+    }
+    EndPrimitive();
+}
@@ -0,0 +1,26 @@
+#version 330
+
+in vec3 point;
+in float radius;
+in float ring_radius;
+in float ring_width;
+in vec4 color;
+in float ring_opacity;
+
+out vec3 v_point;
+out float v_radius;
+out float v_ring_radius;
+out float v_ring_width;
+out vec4 v_color;
+out float v_ring_opacity;
+
+#INSERT rotate_point_for_frame.glsl
+
+void main(){
+    v_point = rotate_point_for_frame(point);
+    v_radius = radius;
+    v_ring_radius = ring_radius;
+    v_ring_width = ring_width;
+    v_color = color;
+    v_ring_opacity = ring_opacity;
+}
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+import sys
+import csv
+import argparse
+import numpy as np
+from manimlib.config import get_module
+from app.modules.sweep import Sweep, get_grid_design, get_random_design, get_latin_hypercube_design
+
+
+def parse_value(value):
+    # Numbers when they parse as one, the scene default decides the rest
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_values(argument):
+    # name=value,value,...
+    name, values = argument.split('=', 1)
+
+    return name, [parse_value(value) for value in values.split(',')]
+
+
+def parse_range(argument):
+    # name=low:high
+    name, values = argument.split('=')
+    low, high = values.split(':')
+
+    return name, (float(low), float(high))
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(
+        description='Run a simulation scene headlessly over a set of its attributes')
+    parser.add_argument('file', help='path to the file holding the scene')
+    parser.add_argument('scene_name', help='name of the scene class')
+    parser.add_argument('--grid', action='append', default=[],
+                        help='name=value,value,... every combination of the grid attributes is run')
+    parser.add_argument('--random', action='append', default=[],
+                        help='name=low:high, drawn uniformly for every point')
+    parser.add_argument('--lhs', action='append', default=[],
+                        help='name=low:high, drawn as a latin hypercube')
+    parser.add_argument('-n', '--number_of_points', type=int, default=10,
+                        help='points drawn for the random or latin hypercube attributes')
+    parser.add_argument('--design_seed', type=int, default=0)
+    parser.add_argument('--seeds', type=int, default=1,
+                        help='runs for every point, with the seeds 0 to seeds - 1')
+    parser.add_argument('--duration', type=float, default=60)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--cache_directory', default='.sweep_cache')
+    parser.add_argument('-o', '--output', help='csv file, the results are printed if it is not given')
+
+    args = parser.parse_args()
+
+    if args.random and args.lhs:
+        parser.error('--random and --lhs can not be used together')
+
+    return args
+
+
+def get_points(args):
+    random_state = np.random.RandomState(args.design_seed)
+
+    grid = get_grid_design(dict(parse_values(argument)
+                                for argument in args.grid))
+
+    if args.random:
+        drawn = get_random_design(dict(parse_range(argument) for argument in args.random),
+                                  args.number_of_points, random_state)
+    elif args.lhs:
+        drawn = get_latin_hypercube_design(dict(parse_range(argument) for argument in args.lhs),
+                                           args.number_of_points, random_state)
+    else:
+        drawn = [{}]
+
+    return [{**grid_point, **drawn_point} for grid_point in grid for drawn_point in drawn]
+
+
+def main():
+    args = parse_cli()
+
+    scene_class = getattr(get_module(args.file), args.scene_name)
+
+    sweep = Sweep(
+        scene_class,
+        get_points(args),
+        seeds=range(args.seeds),
+        duration=args.duration,
+        cache_directory=args.cache_directory,
+        number_of_processes=args.processes
+    )
+
+    results = sweep.get_results()
+
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+
+    writer = csv.DictWriter(output, fieldnames=list(results[0]))
+    writer.writeheader()
+    writer.writerows(results)
+
+    if args.output:
+        output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import pytest
+from app.modules.simulation_engine import SimulationEngine
+
+
+# The defaults of SimpleSimulationScene, the scenes can not be imported without manimlib
+DEFAULT_CONFIG = {
+    'number_of_cities': 1,
+    'city_size': 7,
+    'population': 100,
+    'limit_social_distancing_to_infectious': False,
+    'radius': .1,
+    'infection_radius': .6,
+    'wall_buffer': 1 / 3,
+    'wander_step_size': 1,
+    'wander_step_duration': 1,
+    'gravity_strength': .2,
+    'social_distance_factor': 0,
+    'repel_from_max_number_of_people': 10,
+    'max_speed': .5,
+    'p_symptomatic_on_infection': 1,
+    'infection_duration': 5,
+    'infection_duration_deviation': 0,
+    'probability_of_infection_per_day': .2,
+    'infection_model': 'per_contact',
+    'travel_rate': 0,
+    'travel_network': 'uniform',
+    'gravity_distance_exponent': 2,
+    'gravity_number_of_destinations': 10,
+    'use_spatial_hash': True,
+    'neighbour_list_skin': 0,
+    'neighbour_list_cutoff': None,
+    'time_step': 1 / 60,
+    'interpolate_positions': False,
+    'debug_stats': True,
+    'number_of_workers': 0,
+    'trajectory_path': None,
+    'aggregate_cities': None,
+    'update_frequency': 1 / 15,
+    'colors_set': {},
+}
+
+
+def get_config(**config):
+    return {**DEFAULT_CONFIG, **config}
+
+
+@pytest.fixture
+def make_engine():
+    engines = []
+
+    def make_engine(seed=0, height=7.2, **config):
+        engine = SimulationEngine(
+            config=get_config(**config), height=height, seed=seed)
+        engines.append(engine)
+
+        return engine
+
+    yield make_engine
+
+    for engine in engines:
+        engine.close()
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from app.modules.parallel_simulation_engine import ParallelSimulationEngine
+from tests.conftest import get_config
+
+
+def test_round_trip_continues_the_run(make_engine):
+    engine = make_engine(seed=2, number_of_cities=4, population=50, travel_rate=.5)
+    engine.advance(3)
+
+    checkpoint = engine.get_checkpoint()
+    engine.advance(3)
+
+    restored = make_engine(seed=5, number_of_cities=4, population=50, travel_rate=.5)
+    restored.load_checkpoint(checkpoint)
+    restored.advance(3)
+
+    for name in ['positions', 'statuses', 'city_indices', 'recovery_times']:
+        np.testing.assert_array_equal(
+            getattr(restored.population_state, name), getattr(engine.population_state, name))
+
+    np.testing.assert_array_equal(restored.get_stats(), engine.get_stats())
+    np.testing.assert_array_equal(
+        restored.transmission_log.get('infectees'), engine.transmission_log.get('infectees'))
+
+
+def test_a_checkpoint_is_not_changed_by_the_next_steps(make_engine):
+    engine = make_engine()
+    engine.advance(1)
+
+    checkpoint = engine.get_checkpoint()
+    saved = {name: np.copy(value) for name, value in checkpoint.items()}
+
+    engine.advance(2)
+
+    for name, value in saved.items():
+        np.testing.assert_array_equal(checkpoint[name], value)
+
+
+def test_the_population_has_to_match(make_engine):
+    checkpoint = make_engine(population=100).get_checkpoint()
+
+    with pytest.raises(Exception):
+        make_engine(population=50).load_checkpoint(checkpoint)
+
+
+def test_the_parallel_engine_loads_a_serial_checkpoint(make_engine):
+    checkpoint = make_engine(seed=2, number_of_cities=4, population=50).get_checkpoint()
+
+    engine = ParallelSimulationEngine(
+        config=get_config(number_of_cities=4, population=50), height=7.2, seed=2, number_of_workers=2)
+
+    try:
+        engine.load_checkpoint(checkpoint)
+        engine.advance(1)
+
+        assert engine.get_stats().sum() == 200
+    finally:
+        engine.close()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from app.modules.neighbour_list import NeighbourList
+from app.modules.spatial_hash import get_pairs_within_radius
+
+
+RUN_CONFIGS = [
+    {},
+    {'number_of_cities': 4, 'population': 60, 'travel_rate': .5},
+    {'number_of_cities': 4, 'population': 60, 'social_distance_factor': 1},
+    {'population': 200, 'infection_model': 'per_neighbour_count'},
+]
+
+
+def run(make_engine, duration=15, **config):
+    engine = make_engine(seed=1, **config)
+    engine.advance(duration)
+
+    return engine
+
+
+@pytest.mark.parametrize('config', RUN_CONFIGS)
+def test_runs_are_identical_with_and_without_the_list(make_engine, config):
+    expected = run(make_engine, **config)
+
+    for other_config in [{'neighbour_list_skin': .3}, {'neighbour_list_skin': .3, 'neighbour_list_cutoff': 1},
+                         {'use_spatial_hash': False}]:
+        engine = run(make_engine, **config, **other_config)
+
+        np.testing.assert_array_equal(
+            engine.population_state.statuses, expected.population_state.statuses)
+        np.testing.assert_array_equal(
+            engine.population_state.positions, expected.population_state.positions)
+        np.testing.assert_array_equal(
+            engine.transmission_log.get('infectors'), expected.transmission_log.get('infectors'))
+
+
+def test_the_list_is_reused_between_steps(make_engine):
+    engine = run(make_engine, duration=2, neighbour_list_skin=.3)
+
+    # One build per step would be 120
+    assert 0 < engine.neighbour_list.number_of_builds < 60
+
+
+def test_a_cutoff_under_the_infection_radius_is_rejected(make_engine):
+    with pytest.raises(Exception):
+        make_engine(neighbour_list_skin=.3, neighbour_list_cutoff=.3)
+
+
+def test_exposure_pairs_match_brute_force():
+    random_state = np.random.RandomState(0)
+
+    positions = random_state.random_sample((300, 3)) * 5
+    positions[:, 2] = 0
+    people_indices = np.arange(0, 300, 2)
+    infected = random_state.random_sample(len(people_indices)) < .2
+    susceptible = ~infected
+    infection_radii = np.full(300, .5)
+
+    neighbour_list = NeighbourList(cutoff=.5, skin=.4)
+
+    for _ in range(5):
+        first, second = neighbour_list.get_exposure_pairs(
+            0, people_indices, positions, infected, susceptible, infection_radii)
+
+        query, found = get_pairs_within_radius(
+            positions[people_indices[infected]], positions[people_indices[susceptible]], .5)
+
+        np.testing.assert_array_equal(first, people_indices[infected][query])
+        np.testing.assert_array_equal(second, people_indices[susceptible][found])
+
+        # Less than half the skin, the list is kept
+        positions[people_indices] += (random_state.random_sample((150, 3)) - .5) * .2
+        positions[:, 2] = 0
+
+    assert neighbour_list.number_of_builds < 5
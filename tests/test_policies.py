@@ -0,0 +1,152 @@
+import numpy as np
+from app.modules.ensemble import run_simulation
+from app.modules.policies import AnyTrigger, LockdownCycle, Policy, PolicyScheduler, SocialDistancing, \
+    ThresholdTrigger, TimeTrigger, TravelRate
+from tests.conftest import get_config
+
+
+class RecordedPolicy(Policy):
+    def __init__(self, name, log, duration=0):
+        super().__init__()
+
+        self.name = name
+        self.log = log
+        self.duration = duration
+
+    def apply(self, engine):
+        self.log.append((self.name, engine.time))
+
+    def update(self, engine, start_time, time):
+        return time - start_time < self.duration
+
+
+def add_scheduler(engine):
+    engine.policy_scheduler = PolicyScheduler(engine)
+
+    return engine.policy_scheduler
+
+
+def test_triggers_fire_in_the_order_they_were_added(make_engine):
+    engine = make_engine()
+    scheduler = add_scheduler(engine)
+    log = []
+
+    scheduler.add(TimeTrigger(1), RecordedPolicy('second', log))
+    scheduler.add(TimeTrigger(.5), RecordedPolicy('first', log))
+    scheduler.add(TimeTrigger(1), RecordedPolicy('third', log))
+
+    engine.advance(2)
+
+    assert [name for name, _ in log] == ['first', 'second', 'third']
+    # On the first tick at or after the time
+    assert log[0][1] == np.float64(scheduler.start_times[1])
+    assert .5 <= log[0][1] < .5 + engine.clock.time_step
+    assert log[1][1] == log[2][1]
+
+
+def test_starts_once_and_runs_until_over(make_engine):
+    engine = make_engine()
+    scheduler = add_scheduler(engine)
+    log = []
+
+    scheduler.add(TimeTrigger(0), RecordedPolicy('policy', log, duration=.5))
+
+    engine.advance(.25)
+    assert scheduler.running[0]
+
+    engine.advance(1)
+    assert not scheduler.running[0]
+    assert len(log) == 1
+
+
+def test_threshold_trigger(make_engine):
+    engine = make_engine()
+
+    assert ThresholdTrigger(0, status='I').is_met(engine, 0)
+    assert not ThresholdTrigger(1, status='I').is_met(engine, 0)
+    assert ThresholdTrigger(.5, status='S', fraction=True).is_met(engine, 0)
+    assert ThresholdTrigger(1, status='R', below=True).is_met(engine, 0)
+
+    assert AnyTrigger(ThresholdTrigger(1, status='I'), TimeTrigger(3)).is_met(engine, 3)
+    assert not AnyTrigger(ThresholdTrigger(1, status='I'), TimeTrigger(3)).is_met(engine, 2)
+
+
+def test_social_distancing_and_travel_rate(make_engine):
+    engine = make_engine(number_of_cities=4, population=25)
+    scheduler = add_scheduler(engine)
+
+    scheduler.add(TimeTrigger(1), SocialDistancing(2, city_indices=[0]))
+    scheduler.add(TimeTrigger(1), TravelRate(.5))
+
+    engine.advance(.5)
+    assert engine.travel_rate == 0
+    assert np.all(engine.population_state.social_distance_factors == 0)
+
+    engine.advance(1)
+    population = engine.population_state
+
+    # Only the people of the city then, some of them left it since
+    assert engine.travel_rate == .5
+    assert np.count_nonzero(population.social_distance_factors == 2) == 25
+    assert np.all(np.isin(population.social_distance_factors, [0, 2]))
+
+
+def test_lockdown_cycle(make_engine):
+    engine = make_engine(number_of_cities=2, travel_rate=.2)
+    scheduler = add_scheduler(engine)
+
+    scheduler.add(TimeTrigger(0), LockdownCycle(
+        on_duration=1, off_duration=1, social_distance_factor=1, travel_rate=0, number_of_cycles=2))
+
+    factors = engine.population_state.social_distance_factors
+
+    for on in [True, False, True, False]:
+        engine.advance(.5)
+
+        assert engine.travel_rate == (0 if on else .2)
+        assert np.all(factors == (1 if on else 0))
+
+        engine.advance(.5)
+
+    engine.advance(1)
+    assert not scheduler.running[0]
+    assert engine.travel_rate == .2
+
+
+def test_checkpoint_round_trip(make_engine):
+    def make_run():
+        engine = make_engine(seed=3, number_of_cities=2)
+        scheduler = add_scheduler(engine)
+        scheduler.add(TimeTrigger(0), LockdownCycle(
+            on_duration=1, off_duration=1, social_distance_factor=1, travel_rate=0))
+        scheduler.add(TimeTrigger(2.5), SocialDistancing(2))
+
+        return engine, scheduler
+
+    engine, scheduler = make_run()
+    engine.advance(1.5)
+
+    checkpoint = {**engine.get_checkpoint(), **scheduler.get_checkpoint()}
+
+    engine.advance(2)
+    expected_positions = engine.population_state.positions.copy()
+    expected_start_times = scheduler.start_times.copy()
+
+    restored, restored_scheduler = make_run()
+    restored.load_checkpoint(checkpoint)
+    restored_scheduler.load_checkpoint(checkpoint)
+
+    restored.advance(2)
+
+    np.testing.assert_array_equal(restored.population_state.positions, expected_positions)
+    np.testing.assert_array_equal(restored_scheduler.start_times, expected_start_times)
+
+
+def test_headless_runs_apply_the_policies():
+    config = get_config(population=300)
+
+    samples = run_simulation(config, 0, 7.2, 20, 1 / 15)
+    distancing_samples = run_simulation(
+        config, 0, 7.2, 20, 1 / 15, [(TimeTrigger(0), SocialDistancing(2))])
+
+    assert not np.array_equal(samples, distancing_samples)
@@ -0,0 +1,73 @@
+import numpy as np
+from app.modules.population_state import STATUSES
+from app.modules.stats_recorder import StatsRecorder
+
+
+def test_samples_once_per_interval(make_engine):
+    engine = make_engine()
+    recorder = StatsRecorder(engine, sample_interval=.5)
+
+    for frame in range(1, 31):
+        recorder.update(frame / 10)
+
+    # The first sample is taken on creation
+    times = recorder.get('times')
+
+    assert times[0] == 0
+    assert np.all(np.diff(times) > .5)
+    assert len(recorder) == 6
+
+
+def test_samples_the_engine(make_engine):
+    engine = make_engine(number_of_cities=4, population=50)
+    recorder = StatsRecorder(engine, sample_interval=0)
+
+    for _ in range(10):
+        engine.advance(1)
+        recorder.update(engine.time)
+
+        np.testing.assert_array_equal(recorder.get('stats')[-1], engine.get_stats())
+        np.testing.assert_array_equal(recorder.get('city_stats')[-1], engine.get_city_stats())
+
+    assert recorder.get('city_stats').shape == (len(recorder), 4, len(STATUSES))
+    np.testing.assert_allclose(recorder.get_status_fractions().sum(axis=1), 1)
+
+
+def test_grows_past_its_capacity(make_engine):
+    recorder = StatsRecorder(make_engine(), sample_interval=0, capacity=4)
+
+    for time in range(1, 10):
+        recorder.update(time)
+
+    np.testing.assert_array_equal(recorder.get('times'), np.arange(10))
+
+
+def test_arrays_round_trip(make_engine):
+    engine = make_engine()
+    recorder = StatsRecorder(engine, sample_interval=0)
+
+    for _ in range(5):
+        engine.advance(1)
+        recorder.update(engine.time)
+
+    restored = StatsRecorder(engine, sample_interval=0)
+    restored.set_arrays(recorder.get_arrays())
+
+    for name in StatsRecorder.FIELDS:
+        np.testing.assert_array_equal(restored.get(name), recorder.get(name))
+
+    assert restored.last_sample_time == recorder.last_sample_time
+
+
+def test_saves_a_csv(make_engine, tmp_path):
+    recorder = StatsRecorder(make_engine(number_of_cities=2), sample_interval=0)
+    recorder.update(1)
+
+    path = str(tmp_path / 'stats.csv')
+    recorder.save(path)
+
+    with open(path) as file:
+        lines = file.read().splitlines()
+
+    assert lines[0].split(',')[:5] == ['time', 'S', 'I', 'R', 'A']
+    assert len(lines) == 3
@@ -0,0 +1,57 @@
+import numpy as np
+from app.modules.trajectory import TrajectoryPlayer
+
+
+def record(make_engine, directory, duration=3):
+    engine = make_engine(number_of_cities=2, population=100)
+    engine.record_trajectory(directory, chunk_size=16)
+
+    ticks = {}
+
+    for _ in range(int(duration * 60)):
+        engine.advance(1 / 60)
+        ticks[engine.time] = (engine.population_state.positions.copy(),
+                              engine.population_state.statuses.copy())
+
+    engine.close()
+
+    return engine, ticks
+
+
+def test_replays_every_tick(make_engine, tmp_path):
+    engine, ticks = record(make_engine, str(tmp_path))
+
+    player = TrajectoryPlayer(str(tmp_path))
+
+    for time, (positions, statuses) in ticks.items():
+        player.advance(time - player.time)
+
+        np.testing.assert_allclose(
+            player.population_state.positions, positions.astype(np.float32))
+        np.testing.assert_array_equal(player.population_state.statuses, statuses)
+
+    np.testing.assert_array_equal(player.get_stats(), engine.get_stats())
+    np.testing.assert_array_equal(player.get_city_stats(), engine.get_city_stats())
+
+
+def test_replays_the_transmission_log(make_engine, tmp_path):
+    engine, _ = record(make_engine, str(tmp_path))
+
+    player = TrajectoryPlayer(str(tmp_path))
+
+    assert len(player.transmission_log) == 1
+
+    player.advance(engine.time)
+
+    for name, values in engine.transmission_log.get_arrays().items():
+        np.testing.assert_array_equal(player.transmission_log.get(name), values)
+
+
+def test_is_scaled_to_the_height(make_engine, tmp_path):
+    record(make_engine, str(tmp_path), duration=.5)
+
+    player = TrajectoryPlayer(str(tmp_path))
+    scaled_player = TrajectoryPlayer(str(tmp_path), height=2 * 7.2)
+
+    np.testing.assert_allclose(
+        scaled_player.population_state.positions, player.population_state.positions * scaled_player.scale_factor)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from app.modules.travel_network import TravelNetwork, get_gravity_travel_matrix, get_uniform_travel_matrix, \
+    load_travel_matrix, normalize_travel_matrix
+
+
+def test_normalize_travel_matrix_drops_the_diagonal():
+    travel_matrix = normalize_travel_matrix(np.array([
+        [5, 1, 3],
+        [0, 2, 0],
+        [2, 2, 0],
+    ]))
+
+    np.testing.assert_allclose(travel_matrix.toarray(), [
+        [0, .25, .75],
+        [0, 0, 0],
+        [.5, .5, 0],
+    ])
+
+
+def test_uniform_travel_matrix():
+    travel_matrix = get_uniform_travel_matrix(4).toarray()
+
+    np.testing.assert_allclose(travel_matrix, (1 - np.eye(4)) / 3)
+
+
+def test_gravity_travel_matrix_keeps_the_closest_destinations():
+    city_centers = np.zeros((20, 3))
+    city_centers[:, 0] = np.arange(20) ** 1.5
+
+    travel_matrix = get_gravity_travel_matrix(
+        city_centers, np.full(20, 100), number_of_destinations=3)
+
+    assert np.all(np.diff(travel_matrix.indptr) == 3)
+    assert travel_matrix.diagonal().sum() == 0
+    np.testing.assert_allclose(np.asarray(travel_matrix.sum(axis=1)).ravel(), 1)
+
+    # The closer neighbour draws more of the flow
+    assert travel_matrix[1, 0] > travel_matrix[1, 2]
+
+
+def test_load_travel_matrix_checks_the_shape(tmp_path):
+    path = str(tmp_path / 'network.npz')
+    sparse.save_npz(path, sparse.csr_matrix(np.ones((3, 3))))
+
+    assert load_travel_matrix(path, 3).shape == (3, 3)
+
+    with pytest.raises(Exception):
+        load_travel_matrix(path, 4)
+
+
+def test_sample_destinations_follows_the_rows():
+    network = TravelNetwork(np.array([
+        [0, 1, 3],
+        [0, 0, 0],
+        [1, 0, 0],
+    ]))
+    random_state = np.random.RandomState(0)
+
+    assert list(network.has_destinations) == [True, False, True]
+
+    destinations = network.sample_destinations(
+        np.zeros(20000, dtype=np.int64), random_state)
+
+    assert set(destinations) == {1, 2}
+    assert abs(np.mean(destinations == 2) - .75) < .02
+
+    assert np.all(network.sample_destinations(
+        np.full(100, 2), random_state) == 0)
+
+
+def test_travel_keeps_the_counts(make_engine):
+    engine = make_engine(number_of_cities=9, population=30, travel_rate=1,
+                         travel_network='gravity', gravity_number_of_destinations=2)
+
+    engine.advance(10)
+
+    population = engine.population_state
+
+    # debug_stats checks the maintained counts against a full scan
+    assert engine.get_stats().sum() == 9 * 30
+    assert np.any(np.bincount(population.city_indices, minlength=9) != 30)
+    assert np.array_equal(engine.get_city_stats().sum(axis=1),
+                          np.bincount(population.city_indices, minlength=9))